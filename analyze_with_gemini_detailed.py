@@ -9,8 +9,9 @@ import os
 import re
 import json
 import time
+from collections import Counter
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional
 sys.path.insert(0, str(Path(__file__).parent))
 
 # 環境変数の読み込み
@@ -23,6 +24,14 @@ import google.generativeai as genai
 # ローカルモジュール
 from modules.ocr_handler import OCRHandler
 
+# 正準な分野名。internしておくことで、応答のパース結果を同じ
+# オブジェクトに寄せれば以降の分野比較・辞書引きがポインタ比較で済む
+FIELDS = tuple(sys.intern(f) for f in ('地理', '歴史', '公民', '時事問題', 'その他'))
+
+# 問題抽出プロンプトに載せるテキストの上限文字数。
+# これを超える分は読まれないため、呼び出し側はここまで集めれば足りる
+PROMPT_TEXT_LIMIT = 15000
+
 
 class GeminiDetailedAnalyzer:
     """Gemini APIを使用した詳細な問題分析"""
@@ -42,6 +51,14 @@ class GeminiDetailedAnalyzer:
     
     def extract_questions_from_text(self, text: str) -> List[Dict[str, Any]]:
         """テキストから問題を抽出"""
+        return list(self.extract_questions_iter(text))
+
+    def extract_questions_iter(self, text: str) -> Iterator[Dict[str, Any]]:
+        """テキストから問題を逐次抽出する
+
+        先頭だけ必要な呼び出し側（例: 最初の10問だけ確認するテスト）が
+        itertools.islice で打ち切れるよう、イテレータとして返す。
+        """
         prompt = """
 以下の社会科入試問題のテキストから、すべての問題を抽出してください。
 解答欄や答えの部分は除外し、問題文のみを抽出してください。
@@ -69,20 +86,18 @@ class GeminiDetailedAnalyzer:
 ---
 {}
 ---
-""".format(text[:15000])  # 15000文字まで拡張（全大問をカバー）
-        
+""".format(text[:PROMPT_TEXT_LIMIT])  # 全大問をカバーする上限で切り詰め
+
         try:
             response = self.model.generate_content(prompt)
             result_text = response.text.strip()
-            
+
             # JSONを抽出
             json_match = re.search(r'\{.*\}', result_text, re.DOTALL)
             if json_match:
-                return json.loads(json_match.group())['questions']
-            return []
+                yield from json.loads(json_match.group())['questions']
         except Exception as e:
             print(f"問題抽出エラー: {e}")
-            return []
     
     def analyze_single_question(self, question: Dict[str, Any]) -> Dict[str, Any]:
         """単一の問題を詳細分析"""
@@ -149,6 +164,9 @@ class GeminiDetailedAnalyzer:
             json_match = re.search(r'\{.*\}', result_text, re.DOTALL)
             if json_match:
                 analysis = json.loads(json_match.group())
+                # パース直後に分野名を正準オブジェクトへ寄せる
+                if isinstance(analysis.get('field'), str):
+                    analysis['field'] = sys.intern(analysis['field'])
                 # 問題情報と分析結果を統合
                 return {
                     'number': question['number'],
@@ -289,45 +307,23 @@ class GeminiDetailedAnalyzer:
         if total == 0:
             return {}
         
-        # 分野別集計
-        field_counts = {}
-        theme_list = []
-        difficulty_counts = {'易': 0, '中': 0, '難': 0}
-        format_counts = {}
-        
+        # 分野・難易度・出題形式の集計はCounterのCループに任せる
+        field_counts = Counter(q.get('field', '不明') for q in questions)
+        unique_themes = {theme for q in questions if (theme := q.get('theme'))}
+        difficulty_counter = Counter(q.get('difficulty', '中') for q in questions)
+        difficulty_counts = {d: difficulty_counter.get(d, 0) for d in ('易', '中', '難')}
+        format_counts = Counter(q.get('question_format', 'その他') for q in questions)
+
         # 分野別主要語集計
-        field_keywords = {
-            '地理': set(),
-            '歴史': set(),
-            '公民': set(),
-            '時事問題': set(),
-            'その他': set()
-        }
-        
+        field_keywords = {field: set() for field in FIELDS}
+
         for q in questions:
-            # 分野
-            field = q.get('field', '不明')
-            field_counts[field] = field_counts.get(field, 0) + 1
-            
-            # テーマ
-            if theme := q.get('theme'):
-                theme_list.append(theme)
-            
-            # 難易度
-            difficulty = q.get('difficulty', '中')
-            if difficulty in difficulty_counts:
-                difficulty_counts[difficulty] += 1
-            
-            # 出題形式
-            q_format = q.get('question_format', 'その他')
-            format_counts[q_format] = format_counts.get(q_format, 0) + 1
-            
-            # 分野別キーワード収集
+            # 分野別キーワード収集（1文字のキーワードは除外）
             if keywords := q.get('keywords'):
+                field = q.get('field', '不明')
                 field_key = field if field in field_keywords else 'その他'
-                for kw in keywords:
-                    if kw and len(kw) > 1:  # 1文字のキーワードは除外
-                        field_keywords[field_key].add(kw)
+                field_keywords[field_key].update(
+                    kw for kw in keywords if kw and len(kw) > 1)
         
         # パーセンテージ計算
         field_distribution = {
@@ -358,7 +354,7 @@ class GeminiDetailedAnalyzer:
             'difficulty_distribution': difficulty_counts,
             'format_distribution': format_distribution,
             'field_keywords': field_keywords_dict,  # 分野別キーワードを追加
-            'unique_themes': len(set(theme_list)),
+            'unique_themes': len(unique_themes),
             'total_questions': total
         }
     
@@ -399,7 +395,7 @@ class GeminiDetailedAnalyzer:
             # 分野別主要語一覧
             if field_keywords := stats.get('field_keywords'):
                 print("◆ 分野別主要語一覧:")
-                for field in ['地理', '歴史', '公民', '時事問題', 'その他']:
+                for field in FIELDS:
                     if keywords := field_keywords.get(field):
                         print(f"\n  【{field}】")
                         # 5個ずつ改行して表示
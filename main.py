@@ -276,9 +276,10 @@ class SocialExamAnalyzerGUI:
             school_name = re.sub(r'^[_\-\s]+', '', school_name)
             school_name = re.sub(r'[_\-\s]+$', '', school_name)
             # アンダースコアで分割して最初の部分を取得
-            school_name = school_name.split('_')[0] if '_' in school_name else school_name
+            # （partitionは区切りが無ければ元の文字列をそのまま返す）
+            school_name = school_name.partition('_')[0]
             # 「問題」で分割して学校名部分のみ取得
-            school_name = school_name.split('問題')[0] if '問題' in school_name else school_name
+            school_name = school_name.partition('問題')[0]
             # 最終的なクリーンアップ
             school_name = school_name.strip()
             if school_name:
@@ -7,6 +7,13 @@ AIによる正確な問題構造認識とテーマ抽出
 import os
 import json
 import re
+
+# JSONパースはorjsonがあれば使う（深くネストした応答で数倍速く、
+# 辞書キーがintern済みで返る）。無ければ標準jsonにフォールバック
+try:
+    import orjson as _json
+except ImportError:
+    _json = json
 import logging
 from typing import List, Dict, Tuple, Optional, Union
 from pathlib import Path
@@ -161,7 +168,7 @@ JSONのみを出力してください。
                     elif '```' in json_text:
                         json_text = json_text.split('```')[1].split('```')[0]
                     
-                    page_result = json.loads(json_text.strip())
+                    page_result = _json.loads(json_text.strip())
                     all_results.append(page_result)
                 
                 # 全ページの結果を統合
@@ -307,19 +314,26 @@ JSONのみを出力してください。
         except:
             return 0
     
-    def analyze_exam_structure(self, text: str, school: str = "", year: str = "") -> Dict:
+    def analyze_exam_structure(self, text: str, school: str = "", year: str = "",
+                               max_input_chars: Optional[int] = None,
+                               stream: bool = False) -> Dict:
         """
         入試問題の構造をAIで分析
-        
+
         Args:
             text: OCRされたテキスト
             school: 学校名
             year: 年度
-            
+            max_input_chars: プロンプトに載せるテキストの上限文字数
+                （省略時は15000文字。トークン制限対策）
+            stream: Trueの場合はストリーミングで受信し、応答全体の
+                バッファリング完了を待たずに逐次読み出す
+
         Returns:
             分析結果の辞書
         """
-        
+        input_limit = max_input_chars if max_input_chars else 15000
+
         # プロンプトの構築
         prompt = f"""
 あなたは日本の中学入試問題の専門家です。
@@ -368,17 +382,21 @@ JSONのみを出力してください。
 }}
 
 【テキスト】
-{text[:15000]}  # 最初の15000文字のみ（トークン制限対策）
+{text[:input_limit]}
 
 JSONのみを出力してください。説明は不要です。
 """
-        
+
         try:
             # Gemini APIを呼び出し
-            response = self.model.generate_content(prompt)
-            
-            # レスポンスからJSONを抽出
-            json_text = response.text
+            if stream:
+                # チャンクを生成され次第受け取り、クライアント側の結合と
+                # サーバ側の生成をオーバーラップさせる
+                response = self.model.generate_content(prompt, stream=True)
+                json_text = ''.join(chunk.text for chunk in response)
+            else:
+                response = self.model.generate_content(prompt)
+                json_text = response.text
             
             # JSONブロックを抽出（```json ... ```の形式の場合）
             if '```json' in json_text:
@@ -387,7 +405,7 @@ JSONのみを出力してください。説明は不要です。
                 json_text = json_text.split('```')[1].split('```')[0]
             
             # JSONをパース
-            result = json.loads(json_text.strip())
+            result = _json.loads(json_text.strip())
             
             logger.info(f"Gemini分析成功: {result['summary']['total_questions']}問を検出")
             
@@ -436,7 +454,7 @@ JSONのみを出力してください。
             elif '```' in json_text:
                 json_text = json_text.split('```')[1].split('```')[0]
             
-            result = json.loads(json_text.strip())
+            result = _json.loads(json_text.strip())
             return result
             
         except Exception as e:
@@ -7,6 +7,7 @@ import subprocess
 import json
 import logging
 import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 import os
@@ -296,29 +297,47 @@ class GeminiThemeAnalyzer:
         
         return True
     
-    def analyze_all_questions_with_api(self, questions: List[Dict]) -> List[Dict]:
-        """Gemini APIを使用して全問題を総括的に分析"""
+    def analyze_all_questions_with_api(self, questions: List[Dict],
+                                       batch_size: int = 64,
+                                       concurrency: int = 4) -> List[Dict]:
+        """Gemini APIを使用して全問題を総括的に分析
+
+        問題数がbatch_sizeを超える場合はバッチに分割し、スレッドで
+        同時に複数リクエストを飛ばしてネットワーク往復時間を重ねて隠す。
+        batch_sizeはトークン上限、concurrencyはAPIクォータに合わせて調整する。
+        """
         if not self.api_enabled or not questions:
             logger.warning("Gemini API not available")
             return self.analyze_all_questions(questions)  # フォールバック
-        
+
         try:
-            # プロンプトを作成
-            prompt = self._create_batch_prompt(questions)
-            
-            # Gemini APIを使用
-            response = self.model.generate_content(prompt)
-            
-            if response and response.text:
-                # 応答を解析して適用
-                return self._apply_batch_analysis(response.text, questions)
-            else:
-                logger.warning("Gemini API returned empty response")
-                return questions
-                
+            if len(questions) <= batch_size:
+                # 従来どおり1リクエストで済ませる
+                return self._analyze_batch_with_api(questions)
+
+            # バッチに分割し、同時リクエスト数を絞って並列実行する
+            batches = [questions[i:i + batch_size]
+                       for i in range(0, len(questions), batch_size)]
+            with ThreadPoolExecutor(
+                    max_workers=min(concurrency, len(batches))) as executor:
+                results = executor.map(self._analyze_batch_with_api, batches)
+            return [q for batch_result in results for q in batch_result]
+
         except Exception as e:
             logger.error(f"Gemini API error: {e}")
             return self.analyze_all_questions(questions)  # フォールバック
+
+    def _analyze_batch_with_api(self, questions: List[Dict]) -> List[Dict]:
+        """1バッチ分の問題をAPIで分析する"""
+        prompt = self._create_batch_prompt(questions)
+        response = self.model.generate_content(prompt)
+
+        if response and response.text:
+            # 応答を解析して適用
+            return self._apply_batch_analysis(response.text, questions)
+
+        logger.warning("Gemini API returned empty response")
+        return questions
     
     def analyze_all_questions(self, questions: List[Dict]) -> List[Dict]:
         """全問題を一括で総括的に分析"""
@@ -626,10 +645,19 @@ class GeminiThemeAnalyzer:
         Returns:
             分析結果のリスト
         """
-        results = []
-        for q_num, ocr_text, field in questions:
-            result = self.analyze_theme(ocr_text, field, q_num)
-            results.append(result)
+        if not questions:
+            return []
+
+        # ネットワーク/サブプロセス待ちが支配的なため、スレッドで重ね合わせる
+        # （レート制限を考慮して同時実行は最大8まで）
+        max_workers = min(8, len(questions))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(
+                lambda q: self.analyze_theme(q[1], q[2], q[0]),
+                questions
+            ))
+
+        for (q_num, _, _), result in zip(questions, results):
             logger.info(f"Analyzed {q_num}: {result['theme']} (confidence: {result['confidence']})")
-        
+
         return results
\ No newline at end of file
@@ -27,12 +27,8 @@ class HierarchicalQuestionManager:
     """階層的な問題番号管理クラス"""
     
     def __init__(self):
-        self.root_nodes: List[QuestionNode] = []
-        self.all_nodes: Dict[str, QuestionNode] = {}
-        self.current_major = 0  # 現在の大問番号
-        self.current_minor = 0  # 現在の中問番号
-        self.current_sub = 0    # 現在の小問番号
-        
+        self._reset_state()
+
         # 問題番号パターン（優先順位順）
         self.patterns = {
             'major': [
@@ -52,18 +48,44 @@ class HierarchicalQuestionManager:
             ]
         }
     
+    def _reset_state(self):
+        """抽出状態を初期化"""
+        self.root_nodes: List[QuestionNode] = []
+        self.all_nodes: Dict[str, QuestionNode] = {}
+        self.current_major = 0  # 現在の大問番号
+        self.current_minor = 0  # 現在の中問番号
+        self.current_sub = 0    # 現在の小問番号
+        self._current_major_node: Optional[QuestionNode] = None
+        self._current_minor_node: Optional[QuestionNode] = None
+
     def extract_hierarchical_questions(self, ocr_text: str) -> List[QuestionNode]:
         """OCRテキストから階層的に問題を抽出"""
-        lines = ocr_text.split('\n')
-        self.root_nodes = []
-        self.all_nodes = {}
-        self.current_major = 0
-        self.current_minor = 0
-        self.current_sub = 0
-        
-        current_major_node = None
-        current_minor_node = None
-        
+        self._reset_state()
+        self._consume_lines(ocr_text.split('\n'))
+
+        # 問題番号の修正とバリデーション
+        self._validate_and_fix_numbers()
+
+        return self.root_nodes
+
+    def feed_page(self, page_text: str):
+        """ページ単位のテキストを逐次取り込む（ストリーミング抽出用）
+
+        文書全体を結合せずにページごとに呼び出せる。階層の検出状態は
+        ページをまたいで維持される。最後に finalize() を呼ぶこと。
+        """
+        self._consume_lines(page_text.split('\n'))
+
+    def finalize(self) -> List[Dict]:
+        """ストリーミング取り込みを確定し、フラット化した問題リストを返す"""
+        self._validate_and_fix_numbers()
+        return self.get_flattened_questions()
+
+    def _consume_lines(self, lines: List[str]):
+        """行リストを走査して階層構造を更新する"""
+        current_major_node = self._current_major_node
+        current_minor_node = self._current_minor_node
+
         for i, line in enumerate(lines):
             line = line.strip()
             if not line:
@@ -130,12 +152,11 @@ class HierarchicalQuestionManager:
                 
                 current_minor_node.children.append(sub_node)
                 self.all_nodes[node_id] = sub_node
-        
-        # 問題番号の修正とバリデーション
-        self._validate_and_fix_numbers()
-        
-        return self.root_nodes
-    
+
+        # 次のページに検出状態を引き継ぐ
+        self._current_major_node = current_major_node
+        self._current_minor_node = current_minor_node
+
     def _detect_major_question(self, line: str) -> Optional[re.Match]:
         """大問を検出"""
         for pattern in self.patterns['major']:
@@ -43,21 +43,28 @@ class ImprovedQuestionExtractorV2:
         
         logger.info("ImprovedQuestionExtractorV2 初期化完了")
     
-    def extract_questions(self, text: str) -> List[Tuple[str, str]]:
+    def extract_questions(self, text: str,
+                          prebuilt_structure: Optional[list] = None) -> List[Tuple[str, str]]:
         """
         テキストから問題を抽出（四角囲み数字対応）
-        
+
         Args:
             text: OCRされたテキスト
-            
+            prebuilt_structure: 解析済みの階層構造。呼び出し側が既に
+                同じテキストを階層抽出している場合に渡すと、
+                ここでの再走査を省略できる
+
         Returns:
             [(問題ID, 問題文), ...] のリスト
         """
         questions = []
-        
+
         try:
-            # 階層構造を抽出
-            structure = self.hierarchical_extractor.extract_with_themes(text)
+            # 階層構造を抽出（解析済みのものがあれば再走査しない）
+            if prebuilt_structure is not None:
+                structure = prebuilt_structure
+            else:
+                structure = self.hierarchical_extractor.extract_with_themes(text)
             
             # 構造をフラット化して問題リストに変換
             for major in structure:
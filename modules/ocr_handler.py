@@ -2,16 +2,30 @@
 PDF OCR処理モジュール（社会科目版）
 """
 
+import hashlib
 import os
 import re
 import logging
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Iterator, Optional, Tuple
 import subprocess
 import json
 
 logger = logging.getLogger(__name__)
 
+# OCR正規化用の文字変換テーブル。replace の連鎖は1回ごとに全文を再走査・
+# 再確保するため、1パスの str.translate にまとめる
+_OCR_CHAR_TABLE = str.maketrans({
+    '　': ' ',  # 全角空白→半角
+    # 丸数字→半角
+    '①': '1', '②': '2', '③': '3', '④': '4', '⑤': '5',
+    '⑥': '6', '⑦': '7', '⑧': '8', '⑨': '9', '⑩': '10',
+    # 全角数字→半角
+    **{chr(0xFF10 + i): str(i) for i in range(10)},
+    # チルダ統一
+    '～': '〜',
+})
+
 
 class OCRHandler:
     """PDF OCR処理クラス（社会科目版）"""
@@ -39,12 +53,57 @@ class OCRHandler:
     def process_pdf(self, pdf_path: str) -> Optional[str]:
         """PDFファイルからテキストを抽出"""
         logger.info(f"PDFを処理中: {pdf_path}")
-        
+
         # ファイルの存在確認
         if not os.path.exists(pdf_path):
             logger.error(f"PDFファイルが見つかりません: {pdf_path}")
             return None
-        
+
+        # ディスクキャッシュを確認（OCRは最も遅い処理のため、同一内容のPDFは再利用）
+        cache_path = self._ocr_cache_path(pdf_path)
+        if cache_path is not None and cache_path.exists():
+            logger.info(f"OCRキャッシュを使用: {cache_path.name}")
+            try:
+                return cache_path.read_text(encoding='utf-8')
+            except Exception as e:
+                logger.warning(f"OCRキャッシュの読み込みに失敗: {e}")
+
+        text = self._process_pdf_uncached(pdf_path)
+
+        # ダミーテキストはキャッシュしない
+        if text and cache_path is not None and text != self._get_dummy_text():
+            try:
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                cache_path.write_text(text, encoding='utf-8')
+            except Exception as e:
+                logger.warning(f"OCRキャッシュの書き込みに失敗: {e}")
+
+        return text
+
+    def _ocr_cache_path(self, pdf_path: str) -> Optional[Path]:
+        """PDF内容のハッシュに基づくキャッシュファイルのパスを返す
+
+        キーはファイルサイズ＋先頭と末尾の64KBから計算する。
+        全バイトを読むのと違い大きなPDFでも定数時間で済み、
+        実用上は内容の変更を十分に捉えられる。
+        """
+        try:
+            path = Path(pdf_path)
+            size = path.stat().st_size
+            hasher = hashlib.blake2b(str(size).encode('ascii'), digest_size=16)
+            chunk = 64 * 1024
+            with path.open('rb') as f:
+                hasher.update(f.read(chunk))
+                if size > 2 * chunk:
+                    f.seek(-chunk, os.SEEK_END)
+                    hasher.update(f.read(chunk))
+            return Path('logs/.ocr_cache') / f"{hasher.hexdigest()}.txt"
+        except Exception as e:
+            logger.debug(f"OCRキャッシュキーの計算に失敗: {e}")
+            return None
+
+    def _process_pdf_uncached(self, pdf_path: str) -> Optional[str]:
+        """キャッシュを介さずにPDFからテキストを抽出"""
         # 複数の方法でテキスト抽出を試行
         text = None
         
@@ -80,24 +139,43 @@ class OCRHandler:
         logger.warning("PDF処理に失敗しました。ダミーテキストを使用します")
         return self._get_dummy_text()
 
+    def process_pdf_iter(self, pdf_path: str) -> Iterator[str]:
+        """PDFからページ単位でテキストを逐次抽出するジェネレータ
+
+        文書全体を一度にメモリへ載せず、ページごとに正規化済みテキストを
+        yield する。テキスト層のないPDF（画像ベース）は process_pdf に
+        フォールバックし、全文を1チャンクとして返す。
+        """
+        if not os.path.exists(pdf_path):
+            logger.error(f"PDFファイルが見つかりません: {pdf_path}")
+            return
+
+        try:
+            import pdfplumber
+            with pdfplumber.open(pdf_path) as pdf:
+                # 先頭ページでテキスト層の有無を確認
+                probe = pdf.pages[0].extract_text() if pdf.pages else None
+                if probe and probe.strip():
+                    logger.info("pdfplumberでページ単位のテキスト抽出を開始")
+                    for page in pdf.pages:
+                        page_text = page.extract_text()
+                        if page_text:
+                            yield self._normalize_ocr_text(page_text)
+                    return
+        except Exception as e:
+            logger.debug(f"ページ単位抽出に失敗: {e}")
+
+        # フォールバック: OCR等を含む通常経路で全文を抽出
+        text = self.process_pdf(pdf_path)
+        if text:
+            yield text
+
     def _normalize_ocr_text(self, text: str) -> str:
         """OCR後テキストの正規化（誤分割・全角記号・丸数字などを補正）"""
         if not text:
             return text
-        t = text
-        # 全角空白→半角
-        t = t.replace('\u3000', ' ')
-        # 丸数字→半角
-        circ_pairs = [
-            ('①','1'),('②','2'),('③','3'),('④','4'),('⑤','5'),
-            ('⑥','6'),('⑦','7'),('⑧','8'),('⑨','9'),('⑩','10')
-        ]
-        for a,b in circ_pairs:
-            t = t.replace(a,b)
-        # 全角→半角の一般的な数字
-        t = t.translate(str.maketrans('０１２３４５６７８９', '0123456789'))
-        # チルダ統一
-        t = t.replace('～', '〜')
+        # 全角空白・丸数字・全角数字・チルダを1パスで正規化
+        t = text.translate(_OCR_CHAR_TABLE)
         # 日本語の連続間の空白を除去（促 成 栽 培 → 促成栽培）
         t = re.sub(r'(?<=[一-龥ぁ-んァ-ヴー])\s+(?=[一-龥ぁ-んァ-ヴー])', '', t)
         # 日本語+語尾記号間の不要空白削除
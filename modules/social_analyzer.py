@@ -3,7 +3,16 @@
 地理・歴史・公民の三分野、資料読み取り、時事問題、出題形式を分析
 """
 
-import re
+# 正規表現エンジン：google-re2があれば線形時間のDFA照合を使う
+# （OCRノイズでのバックトラック爆発を避けられる）。無ければ標準re。
+# re2は先読み(?=)(?!)に対応しないため、先読みを含むパターンは
+# 常に標準re（_sre）でコンパイルする
+import re as _sre
+try:
+    import re2 as re
+except ImportError:
+    import re
+from collections import Counter
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, field as dataclass_field
 from enum import Enum
@@ -24,6 +33,26 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# OCRフラグメント判定パターン。問題ごとに呼ばれるため、各選択肢に終端
+# アンカーを埋め込んだ1本の結合パターンをインポート時にコンパイルする。
+# \w に日本語を含むUnicode語文字を期待しているため、常に標準reで
+# コンパイルする（re2の\wはASCIIのみで、日本語断片にマッチしなくなる）
+_FRAGMENT_PATTERN = (
+    r'^(?:'
+    r'記号\s+\w+$'
+    r'|\w{2,4}県\w{1,2}$'
+    r'|[ぁ-ん]+以外$'
+    r'|下線部\s*\w*$'
+    r'|\w+\s+下線部$'
+    r'|[ア-ンA-Z]\s+'
+    r'|\d+年\w{1,2}$'
+    r'|第\d+[条項]$'
+    r'|新詳\w+$'
+    r')'
+)
+_FRAGMENT_RE = _sre.compile(_FRAGMENT_PATTERN)
+_NONWORD_RE = _sre.compile(r'^[\W_]+$')
+
 
 class SocialField(Enum):
     """社会科目の分野"""
@@ -80,11 +109,31 @@ class SocialQuestion:
 class SocialAnalyzer:
     """社会科目問題の分析器"""
     
+    # パターン表は読み取り専用でインスタンス間で共有できるため、
+    # クラス単位で1回だけ構築する（テスト等で繰り返し生成されても
+    # 正規表現の再コンパイルを繰り返さない）
+    _shared_tables = None
+
     def __init__(self):
-        self.field_patterns = self._initialize_field_patterns()
-        self.resource_patterns = self._initialize_resource_patterns()
-        self.format_patterns = self._initialize_format_patterns()
-        self.current_affairs_keywords = self._initialize_current_affairs_keywords()
+        cls = type(self)
+        # __dict__を直接見ることで、初期化メソッドをオーバーライドした
+        # サブクラスは自分用の表を別に構築する
+        tables = cls.__dict__.get('_shared_tables')
+        if tables is None:
+            tables = {
+                'field': self._initialize_field_patterns(),
+                'resource': self._initialize_resource_patterns(),
+                'format': self._initialize_format_patterns(),
+                'current_affairs': self._initialize_current_affairs_keywords(),
+            }
+            cls._shared_tables = tables
+        self.field_patterns = tables['field']
+        self.resource_patterns = tables['resource']
+        self.format_patterns = tables['format']
+        self.current_affairs_keywords = tables['current_affairs']
+
+        # キーワード抽出結果のキャッシュ（テキスト→キーワードリスト）
+        self._kw_cache = {}
         
         # Gemini分析器を初期化（利用可能な場合）
         try:
@@ -106,7 +155,7 @@ class SocialAnalyzer:
             self.improved_extractor = None
             self.theme_extractor_v2 = None
         
-    def _initialize_field_patterns(self) -> Dict[SocialField, List[re.Pattern]]:
+    def _initialize_field_patterns(self) -> Dict[SocialField, List[_sre.Pattern]]:
         """分野判定パターンの初期化（詳細版）"""
         return {
             SocialField.GEOGRAPHY: [
@@ -141,7 +190,7 @@ class SocialAnalyzer:
             ],
         }
     
-    def _initialize_resource_patterns(self) -> Dict[ResourceType, List[re.Pattern]]:
+    def _initialize_resource_patterns(self) -> Dict[ResourceType, List[_sre.Pattern]]:
         """資料種別判定パターンの初期化"""
         return {
             ResourceType.MAP: [
@@ -167,7 +216,7 @@ class SocialAnalyzer:
             ],
         }
     
-    def _initialize_format_patterns(self) -> Dict[QuestionFormat, List[re.Pattern]]:
+    def _initialize_format_patterns(self) -> Dict[QuestionFormat, List[_sre.Pattern]]:
         """出題形式判定パターンの初期化"""
         return {
             QuestionFormat.SHORT_ANSWER: [
@@ -229,7 +278,21 @@ class SocialAnalyzer:
         question.topic = question.theme
         
         return question
-    
+
+    def analyze_questions(self, question_texts: List[str],
+                          number_prefix: str = "問") -> List[SocialQuestion]:
+        """複数の問題文を一括分析する
+
+        分類器のパターン表・キーワード辞書はインスタンスで共有済みのため、
+        呼び出し側のループと属性参照のオーバーヘッドを1回に集約する。
+        結果は入力と同じ順序で返す。
+        """
+        analyze = self.analyze_question  # ループ内の属性参照を回避
+        return [
+            analyze(text, f"{number_prefix}{i}")
+            for i, text in enumerate(question_texts, 1)
+        ]
+
     def _detect_field(self, text: str) -> SocialField:
         """問題文から分野を判定（重み付けスコアリングシステム）"""
         field_scores = {}
@@ -278,7 +341,7 @@ class SocialAnalyzer:
         # それ以外は総合とする
         return SocialField.MIXED
     
-    def _calculate_field_score(self, text: str, field: SocialField, patterns: List[re.Pattern]) -> float:
+    def _calculate_field_score(self, text: str, field: SocialField, patterns: List[_sre.Pattern]) -> float:
         """分野の重み付きスコアを計算"""
         score = 0.0
         
@@ -400,7 +463,16 @@ class SocialAnalyzer:
         return False
     
     def _extract_keywords(self, text: str) -> List[str]:
-        """重要キーワードを抽出（詳細版）"""
+        """重要キーワードを抽出（詳細版）
+
+        正規表現群の走査はテキスト長に比例して重いため、同一テキストの
+        結果はインスタンス内のキャッシュから返す（同じ問題文が複数回
+        現れる資料や、テストの再実行で効く）。
+        """
+        cached = self._kw_cache.get(text)
+        if cached is not None:
+            return cached
+
         keywords = []
         
         # 重要な複合語（2文字+2文字の漢字）を優先的に抽出
@@ -428,15 +500,16 @@ class SocialAnalyzer:
         keywords.extend(quoted)
         
         # 数字を含む用語（第〇次など）
-        numbered = re.findall(r'第\d+[次回条][\w]+', text)
+        # \w に日本語を期待するパターンは標準reで走査する（re2の\wはASCIIのみ）
+        numbered = _sre.findall(r'第\d+[次回条][\w]+', text)
         keywords.extend(numbered)
-        
+
         # 特産品・産業関連
-        products = re.findall(r'([ぁ-ん]{1,3}[県市町村]の[\w]+)', text)
+        products = _sre.findall(r'([ぁ-ん]{1,3}[県市町村]の[\w]+)', text)
         keywords.extend(products)
-        
+
         # 歴史的事件（〇〇の乱、〇〇の変など）
-        events = re.findall(r'([\w]+の(?:乱|変|役|戦い|条約|同盟|会議))', text)
+        events = _sre.findall(r'([\w]+の(?:乱|変|役|戦い|条約|同盟|会議))', text)
         keywords.extend(events)
         
         # 政治機構（参議院、衆議院など）
@@ -444,7 +517,7 @@ class SocialAnalyzer:
         keywords.extend(politics)
         
         # 地名・地域
-        regions = re.findall(r'([\w]+(?:地方|平野|山脈|川|湾|海峡|半島|諸島))', text)
+        regions = _sre.findall(r'([\w]+(?:地方|平野|山脈|川|湾|海峡|半島|諸島))', text)
         keywords.extend(regions)
         
         # 人名（歴史上の人物）
@@ -472,7 +545,13 @@ class SocialAnalyzer:
                 return 2  # その他
         
         unique_keywords.sort(key=keyword_priority)
-        return unique_keywords[:20]  # 最大20個
+        result = unique_keywords[:20]  # 最大20個
+
+        # FIFOの上限付きキャッシュに登録（メモリを一定に保つ）
+        if len(self._kw_cache) >= 4096:
+            self._kw_cache.pop(next(iter(self._kw_cache)))
+        self._kw_cache[text] = result
+        return result
     
     def _extract_time_period(self, text: str) -> Optional[str]:
         """歴史問題から時代を抽出"""
@@ -716,7 +795,8 @@ class SocialAnalyzer:
         ]
         
         for pattern in proper_nouns:
-            match = re.search(pattern, text)
+            # \w に日本語を期待するため標準reで検索（re2の\wはASCIIのみ）
+            match = _sre.search(pattern, text)
             if match:
                 return match.group(1)
         
@@ -1023,24 +1103,10 @@ class SocialAnalyzer:
         if not text:
             return True
         
-        fragment_patterns = [
-            r'^記号\s+\w+$',
-            r'^\w{2,4}県\w{1,2}$',
-            r'^[ぁ-ん]+以外$',
-            r'^下線部\s*\w*$',
-            r'^\w+\s+下線部$',
-            r'^[ア-ンA-Z]\s+',
-            r'^\d+年\w{1,2}$',
-            r'^第\d+[条項]$',
-            r'^新詳\w+$',
-        ]
-        
-        import re
-        for pattern in fragment_patterns:
-            if re.match(pattern, text):
-                return True
-        
-        return len(text) <= 2 or re.match(r'^[\W_]+$', text)
+        if _FRAGMENT_RE.match(text):
+            return True
+
+        return len(text) <= 2 or bool(_NONWORD_RE.match(text))
     
     def _reevaluate_mixed_questions(self, questions: List[SocialQuestion]) -> List[SocialQuestion]:
         """総合と判定された問題を再評価し、全体の傾向に基づいて分野を調整"""
@@ -1102,7 +1168,8 @@ class SocialAnalyzer:
         # ノイズを除外
         cleaned_text = text
         for pattern in noise_patterns:
-            cleaned_text = re.sub(pattern, '', cleaned_text, flags=re.MULTILINE)
+            # MULTILINEはインラインフラグで指定（re2はflags引数を持たない）
+            cleaned_text = re.sub('(?m)' + pattern, '', cleaned_text)
         
         # 大問構造を認識
         large_question_matches = list(re.finditer(r'大問(\d+)', cleaned_text))
@@ -1140,10 +1207,11 @@ class SocialAnalyzer:
         sub_questions = []
         
         # 小問のパターン
+        # 先読み(?=...)を含むため標準reでコンパイルする（re2は非対応）
         patterns = [
-            re.compile(r'問(\d+)[\.、\s](.+?)(?=問\d+|$)', re.DOTALL),
-            re.compile(r'(\d+)[\.、\s](.+?)(?=\d+[\.、\s]|$)', re.DOTALL),
-            re.compile(r'【問(\d+)】(.+?)(?=【問\d+】|$)', re.DOTALL),
+            _sre.compile(r'問(\d+)[\.、\s](.+?)(?=問\d+|$)', _sre.DOTALL),
+            _sre.compile(r'(\d+)[\.、\s](.+?)(?=\d+[\.、\s]|$)', _sre.DOTALL),
+            _sre.compile(r'【問(\d+)】(.+?)(?=【問\d+】|$)', _sre.DOTALL),
         ]
         
         for pattern in patterns:
@@ -1159,10 +1227,11 @@ class SocialAnalyzer:
         questions = []
         
         # 問題番号のパターン
+        # 先読み(?=...)を含むため標準reでコンパイルする（re2は非対応）
         patterns = [
-            re.compile(r'問(\d+)[\.、\s](.+?)(?=問\d+|$)', re.DOTALL),
-            re.compile(r'(\d+)[\.、\s](.+?)(?=\d+[\.、\s]|$)', re.DOTALL),
-            re.compile(r'【問(\d+)】(.+?)(?=【問\d+】|$)', re.DOTALL),
+            _sre.compile(r'問(\d+)[\.、\s](.+?)(?=問\d+|$)', _sre.DOTALL),
+            _sre.compile(r'(\d+)[\.、\s](.+?)(?=\d+[\.、\s]|$)', _sre.DOTALL),
+            _sre.compile(r'【問(\d+)】(.+?)(?=【問\d+】|$)', _sre.DOTALL),
         ]
         
         for pattern in patterns:
@@ -1328,45 +1397,41 @@ class SocialAnalyzer:
         total = len(questions)
         if total == 0:
             return {}
-        
-        # 分野別集計
-        field_counts = {}
-        for q in questions:
-            field_counts[q.field.value] = field_counts.get(q.field.value, 0) + 1
-        
-        # 資料種別集計
-        resource_counts = {}
+
+        # 問題リストを1回だけ走査して全集計を同時に行う
+        # （項目ごとに5回リストを回していたのを単一パスに統合）
+        field_counts = Counter()
+        resource_counts = Counter()
+        format_counts = Counter()
+        current_affairs_count = 0
+        has_resources_count = 0
+
         for q in questions:
+            field_counts[q.field.value] += 1
+            format_counts[q.question_format.value] += 1
             for r in q.resource_types:
-                resource_counts[r.value] = resource_counts.get(r.value, 0) + 1
-        
-        # 出題形式集計
-        format_counts = {}
-        for q in questions:
-            format_counts[q.question_format.value] = format_counts.get(q.question_format.value, 0) + 1
-        
-        # 時事問題の割合
-        current_affairs_count = sum(1 for q in questions if q.is_current_affairs)
-        
+                resource_counts[r.value] += 1
+            if q.is_current_affairs:
+                current_affairs_count += 1
+            if ResourceType.NONE not in q.resource_types:
+                has_resources_count += 1
+
+        def pct(counts):
+            return {
+                k: {'count': v, 'percentage': round(v / total * 100, 1)}
+                for k, v in counts.items()
+            }
+
         return {
-            'field_distribution': {
-                k: {'count': v, 'percentage': round(v/total*100, 1)}
-                for k, v in field_counts.items()
-            },
-            'resource_usage': {
-                k: {'count': v, 'percentage': round(v/total*100, 1)}
-                for k, v in resource_counts.items()
-            },
-            'format_distribution': {
-                k: {'count': v, 'percentage': round(v/total*100, 1)}
-                for k, v in format_counts.items()
-            },
+            'field_distribution': pct(field_counts),
+            'resource_usage': pct(resource_counts),
+            'format_distribution': pct(format_counts),
             'current_affairs': {
                 'count': current_affairs_count,
-                'percentage': round(current_affairs_count/total*100, 1)
+                'percentage': round(current_affairs_count / total * 100, 1)
             },
             'has_resources': {
-                'count': sum(1 for q in questions if ResourceType.NONE not in q.resource_types),
-                'percentage': round(sum(1 for q in questions if ResourceType.NONE not in q.resource_types)/total*100, 1)
+                'count': has_resources_count,
+                'percentage': round(has_resources_count / total * 100, 1)
             }
         }
\ No newline at end of file
@@ -31,6 +31,7 @@ from .social_analyzer import (
     SocialAnalyzer as BaseSocialAnalyzer
 )
 from .theme_knowledge_base import ThemeKnowledgeBase
+from .text_index import TextIndex
 
 logger = logging.getLogger(__name__)
 
@@ -1167,10 +1168,20 @@ class FixedSocialAnalyzer(BaseSocialAnalyzer):
         
         return has_keywords or is_long_enough
     
-    def analyze_document(self, text: str) -> Dict[str, Any]:
-        """改善された文書分析（文脈情報を保持）"""
+    def analyze_document(self, text: str,
+                         index: Optional[TextIndex] = None) -> Dict[str, Any]:
+        """改善された文書分析（文脈情報を保持）
+
+        indexを渡すと、呼び出し側で構築済みのTextIndexを再利用して
+        全文の再分割を省く。省略時はここで1回だけ構築する。
+        """
         # 全体テキストを保存（問題分析時に使用）
         self._current_full_text = text
+        # 位置インデックスを共有（設問ごとの行分割の繰り返しを避ける）
+        # textがNone/空の場合は従来のエラー経路に任せる
+        if index is None and text:
+            index = TextIndex.build(text)
+        self._current_index = index
         
         # 問題を抽出
         questions = self._extract_questions(text)
@@ -1921,7 +1932,13 @@ class FixedSocialAnalyzer(BaseSocialAnalyzer):
         if not search_fragment:
             return question_text
         
-        lines = full_text.split('\n')
+        # analyze_documentで構築済みのインデックスがあれば行分割を使い回す
+        # （設問ごとに全文をsplitし直さない）
+        index = getattr(self, '_current_index', None)
+        if index is not None and index.raw is full_text:
+            lines = index.lines
+        else:
+            lines = full_text.split('\n')
         enhanced_lines = []
         
         for i, line in enumerate(lines):
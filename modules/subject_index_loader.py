@@ -8,12 +8,25 @@ from pathlib import Path
 from typing import List, Dict, Set
 import logging
 
+# pyahocorasickがあれば語句照合をオートマトンの1回走査で行う（任意依存）
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 logger = logging.getLogger(__name__)
 
 
 class SubjectIndexLoader:
     """subject_index.md から重要語句を抽出し、優先度の高いテーマを判定"""
-    
+
+    # 特に重要な語句（ユーザーが言及した「促成栽培」など）
+    _HIGH_PRIORITY_TERMS = frozenset([
+        '促成栽培', '抑制栽培', '四大工業地帯', '三権分立',
+        '基本的人権', '高度経済成長', '明治維新', '鎌倉幕府'
+    ])
+
+
     def __init__(self):
         """初期化"""
         self.important_terms = {
@@ -23,6 +36,21 @@ class SubjectIndexLoader:
             'all': set()
         }
         self.load_subject_index()
+
+        # 語句→所属分野の索引を1回だけ構築し、検索時は分野ごとの
+        # 全語句ループではなく照合済み語句だけを分類する
+        self._term_fields: Dict[str, List[str]] = {}
+        for field in ('history', 'geography', 'civics'):
+            for term in sorted(self.important_terms[field]):
+                self._term_fields.setdefault(term, []).append(field)
+
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for term in self._term_fields:
+                self._automaton.add_word(term, term)
+            self._automaton.make_automaton()
+        else:
+            self._automaton = None
     
     def load_subject_index(self):
         """subject_index.md を読み込み、重要語句を抽出"""
@@ -109,26 +137,26 @@ class SubjectIndexLoader:
             'civics': [],
             'priority_themes': []  # 最優先テーマ
         }
-        
-        # 各分野の語句を検索
-        for field in ['history', 'geography', 'civics']:
-            for term in self.important_terms[field]:
-                if term in text:
+
+        # オートマトンがあればテキストを1回走査、無ければ語句索引を
+        # 使った純Python照合にフォールバック
+        if self._automaton is not None:
+            matched = {term for _, term in self._automaton.iter(text)}
+        else:
+            matched = {term for term in self._term_fields if term in text}
+
+        for term, fields in self._term_fields.items():
+            if term in matched:
+                for field in fields:
                     found_terms[field].append(term)
-        
+
         # 優先度の高いテーマを判定
         all_found = found_terms['history'] + found_terms['geography'] + found_terms['civics']
-        
-        # 特に重要な語句（ユーザーが言及した「促成栽培」など）
-        high_priority_terms = [
-            '促成栽培', '抑制栽培', '四大工業地帯', '三権分立',
-            '基本的人権', '高度経済成長', '明治維新', '鎌倉幕府'
-        ]
-        
+
         for term in all_found:
-            if term in high_priority_terms:
+            if term in self._HIGH_PRIORITY_TERMS:
                 found_terms['priority_themes'].append(term)
-        
+
         return found_terms
     
     def get_field_from_terms(self, terms: List[str]) -> str:
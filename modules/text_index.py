@@ -0,0 +1,40 @@
+"""
+OCRテキストの共有位置インデックス
+
+OCR → 抽出器 → 分析器のパイプラインは各段階で全文を走査し直すため、
+大きなテキストでは同じ分割・検索が3〜4回繰り返される。
+TextIndexは行分割と設問・大問マーカーの位置を1回だけ求めて保持し、
+下流のモジュールに渡して再走査を省くための軽量コンテナ。
+"""
+
+import re
+from dataclasses import dataclass, field as dataclass_field
+from typing import List, Tuple
+
+# 設問マーカー（問1 / 問 1）と大問マーカー（大問1 / □1□）
+_QNUM_RE = re.compile(r'問\s*(\d+)')
+_MAJOR_RE = re.compile(r'(?:大問\s*(\d+)|□\s*(\d+)\s*□)')
+
+
+@dataclass
+class TextIndex:
+    """全文と、その上に1回の走査で構築した位置情報"""
+    raw: str
+    lines: List[str] = dataclass_field(default_factory=list)
+    # (開始オフセット, 終了オフセット, 番号文字列)
+    q_offsets: List[Tuple[int, int, str]] = dataclass_field(default_factory=list)
+    major_offsets: List[Tuple[int, int, str]] = dataclass_field(default_factory=list)
+
+    @classmethod
+    def build(cls, text: str) -> 'TextIndex':
+        """テキストを1回走査してインデックスを構築する"""
+        lines = text.split('\n')
+        q_offsets = [
+            (m.start(), m.end(), m.group(1))
+            for m in _QNUM_RE.finditer(text)
+        ]
+        major_offsets = [
+            (m.start(), m.end(), m.group(1) or m.group(2))
+            for m in _MAJOR_RE.finditer(text)
+        ]
+        return cls(text, lines, q_offsets, major_offsets)
@@ -3,7 +3,16 @@
 根本的な仕組みの改善により、より正確で具体的なテーマ抽出を実現
 """
 
-import re
+import functools
+# 正規表現エンジン：google-re2があれば線形時間のDFA照合を使う
+# （OCRノイズでのバックトラック爆発を避けられる）。無ければ標準re。
+# re2は先読み(?=)(?!)に対応しないため、先読みを含むパターンは
+# 常に標準re（_sre）でコンパイルする
+import re as _sre
+try:
+    import re2 as re
+except ImportError:
+    import re
 from typing import Optional, List, Dict, Tuple
 from dataclasses import dataclass
 import logging
@@ -11,14 +20,203 @@ import logging
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ExtractedTheme:
-    """抽出されたテーマ"""
+    """抽出されたテーマ（キャッシュ共有されるため不変・__dict__なし）"""
     theme: Optional[str]
     category: Optional[str]  # 地理/歴史/公民
     confidence: float
     
     
+# 除外パターンはインスタンス生成のたびに再コンパイルしないよう、
+# インポート時に一度だけコンパイルしてモジュールスコープで共有する
+_EXCLUSION_PATTERNS: Tuple[_sre.Pattern, ...] = tuple([
+        # === 基本的な指示語・接続語 ===
+        # 指示語のみ（単独）
+        re.compile(r'^(にあてはまる|あてはまる|答えなさい|選びなさい|について|として|に関して)$'),
+        # 短すぎる断片（3文字以下）
+        re.compile(r'^.{1,3}(について|として|に関する|の仕組み|の説明)$'),
+        
+        # === 問題形式の表現 ===
+        # 問題番号や記号
+        re.compile(r'^(問\d+|【[あ-おア-オ]】|\([あ-おア-オ]\))'),
+        # 文字数指定
+        re.compile(r'^\d+字(以上|以内)'),
+        # 説明の断片
+        re.compile(r'^(説明として|関連して|関する文|期間におきた)'),
+        
+        # === 空欄・穴埋め関連 ===
+        # 空欄補充・穴埋め（単独の場合のみ除外）
+        re.compile(r'^(空欄補充|穴埋め|空らん)$'),
+        # 記号や括弧のみの内容
+        re.compile(r'^【[あ-んア-ン]】$|^\([あ-んア-ン]\)$'),
+        # 【】にあてはまる形式のみ
+        re.compile(r'^【[あ-んア-ン]】.*?にあてはまる$'),  # 【い】にあてはまる
+        re.compile(r'^にあてはまる.*?(人物名|語句|言葉)$'),  # にあてはまる人物名
+        
+        # === 「次の〜」パターン ===
+        # 図表等の紹介だけで具体性がないものは除外（読み取り/分析/説明がなければ除外）
+        # ただし、問題文として機能するものは除外しない
+        _sre.compile(r'^次の(図|グラフ|資料|写真|地図|雨温図)(?!.*?(読み取|分析|説明|答え|選び|見て))$'),
+        _sre.compile(r'^次の表(?!.*?(読み取|分析|説明|答え|選び|見て))$'),
+        re.compile(r'^以下の(うち|中から|選択肢)$'),  # 以下のうちなど
+        re.compile(r'^次のア〜$'),  # 次のア〜エからなど
+        re.compile(r'から選べ$'),  # 「〜から選べ」で終わる文
+        
+        # === 下線部関連 ===
+        # 下線部単独、または下線部+番号/記号のみを除外
+        re.compile(r'^下線部[①-⑳⑪-⑯⑰-⑳❶-❿⓫-⓴]?$'),  # 下線部①など
+        re.compile(r'^下線部\d+$'),  # 下線部6など
+        re.compile(r'^下線部の(内容|特徴|説明|史料)'),  # 下線部の特徴など
+        re.compile(r'^下線部.*?として'),  # 下線部の史料としてなど
+        re.compile(r'^傍線部'),  # 傍線部も同様
+        
+        # === 参照・引用関連 ===
+        # 不完全な表現
+        re.compile(r'^この当時の'),
+        re.compile(r'^同年'),
+        re.compile(r'^この年'),
+        re.compile(r'^当時の'),
+        re.compile(r'^その後の'),
+        
+        # === 技術・現代的用語（社会科に不適切） ===
+        # ホームページやウェブサイト（社会科に不適切）
+        re.compile(r'(ホームページ|ウェブサイト|ウェブページ|Webサイト|気象庁ホームページ)'),
+        # 社会科に無関係な用語（産業文脈で有用な「電子機器」は除外対象から外す）
+        re.compile(r'(電気機械器具|コンピュータ|スマートフォン|携帯電話|グリーンマーク)'),
+        # 現代的すぎる概念
+        re.compile(r'(インターネット|ソーシャルメディア|SNS|AI|人工知能)'),
+        
+        # === 教科横断・他教科用語 ===
+        # 国語関連（社会科ではない）
+        re.compile(r'(読書感想文|作文|小説|俳句|短歌|詩|文学作品).*?(特徴|内容|分析)'),
+        # 理科関連（地理と重複しないもの）
+        re.compile(r'(実験|観察|化学式|分子|原子|DNA)'),
+        # 数学関連
+        re.compile(r'(方程式|関数|図形|証明)'),
+        
+        # === 曖昧すぎる表現 ===
+        # 河川部など不明瞭な表現
+        re.compile(r'(河川部の内容|部の内容)$'),
+        # 「〜の内容」だけの曖昧な表現（3文字以下）
+        re.compile(r'^.{1,3}の内容$'),
+        # 極端に一般的な表現
+        re.compile(r'^(内容|特徴|理由|原因|結果|影響|意味|目的)$'),
+        # 「具体的な」で始まる指示
+        re.compile(r'^具体的な'),
+        re.compile(r'を用いて.*事例'),  # 「〜を用いて〜事例」パターン
+        
+        # === 問題解答指示 ===
+        # 解答形式の指定（単独の場合のみ除外）
+        re.compile(r'^(漢字で答え|ひらがなで答え|カタカナで答え)$'),
+        re.compile(r'^(記号で答え|番号で答え|選択肢)$'),
+        re.compile(r'^(正しい|適切な|誤って|間違って).*?(選び|答え)$'),
+        
+        # === 地図・図表の参照（文脈なしでは無意味） ===
+        # 地図中の〜（位置指定）- ただし都市名や地域名がある場合は除外しない
+        _sre.compile(r'^地図中の(?!.*?(都市|地域|県|国|山|川|平野))'),
+        _sre.compile(r'^(図中の|表中の|グラフ中の)(?!.*?(読み取|分析|説明))'),
+        # アルファベット・記号での場所指定
+        re.compile(r'^[A-Z]([地点|地域|都市|県|国])'),
+        re.compile(r'^[ア-ン]([地点|地域|都市|県|国])'),
+        
+        # === 時間・順序関係（文脈依存） ===
+        re.compile(r'^(その後|それ以降|以前|以後|同時期|当該期間)'),
+        re.compile(r'^第[一二三四五六七八九十]期'),
+        
+        # === 不完全な固有名詞 ===
+        # 〜県の特徴（県名が具体的でない場合）
+        re.compile(r'^この(県|府|道|都|地方|地域)の'),
+        # A国、B国のような抽象的表現
+        re.compile(r'^[A-Z]国'),
+
+        # === その他の参照テキスト（内容が不十分）===
+        # 新聞記事の内容など、教材参照のみの断片
+        re.compile(r'新聞記事の内容'),
+        # 「以下の表」を含むが読み取り等が無い場合は除外
+        _sre.compile(r'以下の表(?!.*?(読み取|分析|説明))$'),
+    ])
+
+# 除外判定の一次スキャン用に全パターンを1本の選択肢にまとめたもの。
+# 非除外テキスト（大多数）はこの1回の search だけで抜けられる
+# （先読みを含むパターンを束ねるため標準reでコンパイルする）
+_EXCLUSION_SCAN = _sre.compile('|'.join(f'(?:{p.pattern})' for p in _EXCLUSION_PATTERNS))
+
+# 正規表現メタ文字を含まない純粋な語句（アンカーなしの選択肢・単独リテラル）を
+# 抜き出したもの。Aho-Corasick による O(|text|) の先行判定に使う
+_LITERAL_ALTERNATION_RE = re.compile(
+    r'^\((?:[^()|\\^$.*+?\[\]{}]+\|)*[^()|\\^$.*+?\[\]{}]+\)$'
+)
+_BARE_LITERAL_RE = re.compile(r'^[^()|\\^$.*+?\[\]{}]+$')
+_EXCLUSION_LITERALS = tuple(
+    phrase
+    for p in _EXCLUSION_PATTERNS
+    if _LITERAL_ALTERNATION_RE.match(p.pattern) or _BARE_LITERAL_RE.match(p.pattern)
+    for phrase in (p.pattern[1:-1].split('|') if p.pattern.startswith('(') else [p.pattern])
+)
+
+# pyahocorasick が利用可能なら、リテラル語句はオートマトン1回の走査で判定する（任意依存）
+try:
+    import ahocorasick
+    _EXCLUSION_AUTOMATON = ahocorasick.Automaton()
+    for _phrase in _EXCLUSION_LITERALS:
+        _EXCLUSION_AUTOMATON.add_word(_phrase, _phrase)
+    _EXCLUSION_AUTOMATON.make_automaton()
+except Exception:
+    _EXCLUSION_AUTOMATON = None
+
+
+# _refine_theme_from_keywords で使うキーワード表。語ごとのin判定を
+# 重ねる代わりに、結合した1本のパターンでテキストを1回走査し、
+# ヒット集合を表の定義順（= 従来のif連鎖の優先順）で引く
+_DIRECT_THEMES = (
+    ('鎌倉幕府', ('鎌倉幕府の成立', '歴史', 0.9)),
+    ('室町幕府', ('室町幕府の政治', '歴史', 0.9)),
+    ('江戸幕府', ('江戸幕府の政治', '歴史', 0.9)),
+    ('徳川幕府', ('江戸幕府の政治', '歴史', 0.9)),
+    ('江戸時代', None),  # 「身分」の有無で分岐する（呼び出し側で特別扱い）
+    ('明治維新', ('明治維新の改革', '歴史', 0.9)),
+    ('大日本帝国憲法', ('大日本帝国憲法の内容', '歴史', 0.9)),
+    ('日本国憲法', ('日本国憲法の内容', '公民', 0.9)),
+    ('人口ピラミッド', ('人口ピラミッドの分析', '地理', 0.95)),
+)
+_DIRECT_THEME_RE = re.compile('|'.join(re.escape(k) for k, _ in _DIRECT_THEMES))
+
+_CIVICS_THEMES = (
+    ('プライバシー', 'プライバシーの権利'),
+    ('オンブズマン', 'オンブズマン制度の仕組み'),
+    ('国土交通省', '国土交通省の役割'),
+    ('市町村合併', '市町村合併の目的'),
+    ('合併', '市町村合併の目的'),
+    ('裁判員', '裁判員制度の仕組み'),
+    ('個人情報', '個人情報保護の仕組み'),
+)
+_CIVICS_THEME_RE = re.compile('|'.join(re.escape(k) for k, _ in _CIVICS_THEMES))
+
+_HISTORY_EVENTS = (
+    '大化の改新', '承久の乱', '応仁の乱', '本能寺の変', '関ヶ原の戦い',
+    '明治維新', '太平洋戦争', '日露戦争', '第一次世界大戦', '第二次世界大戦',
+)
+_HISTORY_EVENT_RE = re.compile('|'.join(re.escape(k) for k in _HISTORY_EVENTS))
+
+_COUNTRIES = (
+    'フィリピン', 'ウルグアイ', 'ブラジル', 'アメリカ合衆国', 'アメリカ',
+    '中国', 'インド',
+)
+_COUNTRY_RE = re.compile('|'.join(re.escape(k) for k in _COUNTRIES))
+
+
+def _first_hit(regex, keys, text):
+    """1回の走査でヒットを集め、keysの順で最初に現れる語を返す"""
+    hits = set(regex.findall(text))
+    if not hits:
+        return None
+    for key in keys:
+        if key in hits:
+            return key
+    return None
+
+
 class ThemeExtractorV2:
     """
     改善版テーマ抽出器
@@ -52,8 +250,11 @@ class ThemeExtractorV2:
                 self.terms_repo = repo
         except Exception:
             self.terms_repo = None
+
+        # 同一テキストの再抽出は辞書参照で済ませる（実試験は類似表現が多い）
+        self._extract_cached = functools.lru_cache(maxsize=4096)(self._extract_impl)
         
-    def _init_specific_patterns(self) -> Dict[str, List[Tuple[re.Pattern, str, str]]]:
+    def _init_specific_patterns(self) -> Dict[str, List[Tuple[_sre.Pattern, str, str]]]:
         """固有名詞や具体的事象のパターン（2文節形式）"""
         return {
             '歴史_事件': [
@@ -236,7 +437,7 @@ class ThemeExtractorV2:
             '都市': (major_cities, '地理'),
         }
     
-    def _init_abstract_patterns(self) -> List[Tuple[re.Pattern, str]]:
+    def _init_abstract_patterns(self) -> List[Tuple[_sre.Pattern, str]]:
         """抽象的な概念のパターン"""
         return [
             (re.compile(r'資料.*?読み取り'), '資料の読み取り'),
@@ -287,118 +488,17 @@ class ThemeExtractorV2:
             (re.compile(r'図中.*?記号'), '図の読み取り'),
         ]
     
-    def _init_exclusion_patterns(self) -> List[re.Pattern]:
-        """除外すべきパターン（強化版）"""
-        return [
-            # === 基本的な指示語・接続語 ===
-            # 指示語のみ（単独）
-            re.compile(r'^(にあてはまる|あてはまる|答えなさい|選びなさい|について|として|に関して)$'),
-            # 短すぎる断片（3文字以下）
-            re.compile(r'^.{1,3}(について|として|に関する|の仕組み|の説明)$'),
-            
-            # === 問題形式の表現 ===
-            # 問題番号や記号
-            re.compile(r'^(問\d+|【[あ-おア-オ]】|\([あ-おア-オ]\))'),
-            # 文字数指定
-            re.compile(r'^\d+字(以上|以内)'),
-            # 説明の断片
-            re.compile(r'^(説明として|関連して|関する文|期間におきた)'),
-            
-            # === 空欄・穴埋め関連 ===
-            # 空欄補充・穴埋め（単独の場合のみ除外）
-            re.compile(r'^(空欄補充|穴埋め|空らん)$'),
-            # 記号や括弧のみの内容
-            re.compile(r'^【[あ-んア-ン]】$|^\([あ-んア-ン]\)$'),
-            # 【】にあてはまる形式のみ
-            re.compile(r'^【[あ-んア-ン]】.*?にあてはまる$'),  # 【い】にあてはまる
-            re.compile(r'^にあてはまる.*?(人物名|語句|言葉)$'),  # にあてはまる人物名
-            
-            # === 「次の〜」パターン ===
-            # 図表等の紹介だけで具体性がないものは除外（読み取り/分析/説明がなければ除外）
-            # ただし、問題文として機能するものは除外しない
-            re.compile(r'^次の(図|グラフ|資料|写真|地図|雨温図)(?!.*?(読み取|分析|説明|答え|選び|見て))$'),
-            re.compile(r'^次の表(?!.*?(読み取|分析|説明|答え|選び|見て))$'),
-            re.compile(r'^以下の(うち|中から|選択肢)$'),  # 以下のうちなど
-            re.compile(r'^次のア〜$'),  # 次のア〜エからなど
-            re.compile(r'から選べ$'),  # 「〜から選べ」で終わる文
-            
-            # === 下線部関連 ===
-            # 下線部単独、または下線部+番号/記号のみを除外
-            re.compile(r'^下線部[①-⑳⑪-⑯⑰-⑳❶-❿⓫-⓴]?$'),  # 下線部①など
-            re.compile(r'^下線部\d+$'),  # 下線部6など
-            re.compile(r'^下線部の(内容|特徴|説明|史料)'),  # 下線部の特徴など
-            re.compile(r'^下線部.*?として'),  # 下線部の史料としてなど
-            re.compile(r'^傍線部'),  # 傍線部も同様
-            
-            # === 参照・引用関連 ===
-            # 不完全な表現
-            re.compile(r'^この当時の'),
-            re.compile(r'^同年'),
-            re.compile(r'^この年'),
-            re.compile(r'^当時の'),
-            re.compile(r'^その後の'),
-            
-            # === 技術・現代的用語（社会科に不適切） ===
-            # ホームページやウェブサイト（社会科に不適切）
-            re.compile(r'(ホームページ|ウェブサイト|ウェブページ|Webサイト|気象庁ホームページ)'),
-            # 社会科に無関係な用語（産業文脈で有用な「電子機器」は除外対象から外す）
-            re.compile(r'(電気機械器具|コンピュータ|スマートフォン|携帯電話|グリーンマーク)'),
-            # 現代的すぎる概念
-            re.compile(r'(インターネット|ソーシャルメディア|SNS|AI|人工知能)'),
-            
-            # === 教科横断・他教科用語 ===
-            # 国語関連（社会科ではない）
-            re.compile(r'(読書感想文|作文|小説|俳句|短歌|詩|文学作品).*?(特徴|内容|分析)'),
-            # 理科関連（地理と重複しないもの）
-            re.compile(r'(実験|観察|化学式|分子|原子|DNA)'),
-            # 数学関連
-            re.compile(r'(方程式|関数|図形|証明)'),
-            
-            # === 曖昧すぎる表現 ===
-            # 河川部など不明瞭な表現
-            re.compile(r'(河川部の内容|部の内容)$'),
-            # 「〜の内容」だけの曖昧な表現（3文字以下）
-            re.compile(r'^.{1,3}の内容$'),
-            # 極端に一般的な表現
-            re.compile(r'^(内容|特徴|理由|原因|結果|影響|意味|目的)$'),
-            # 「具体的な」で始まる指示
-            re.compile(r'^具体的な'),
-            re.compile(r'を用いて.*事例'),  # 「〜を用いて〜事例」パターン
-            
-            # === 問題解答指示 ===
-            # 解答形式の指定（単独の場合のみ除外）
-            re.compile(r'^(漢字で答え|ひらがなで答え|カタカナで答え)$'),
-            re.compile(r'^(記号で答え|番号で答え|選択肢)$'),
-            re.compile(r'^(正しい|適切な|誤って|間違って).*?(選び|答え)$'),
-            
-            # === 地図・図表の参照（文脈なしでは無意味） ===
-            # 地図中の〜（位置指定）- ただし都市名や地域名がある場合は除外しない
-            re.compile(r'^地図中の(?!.*?(都市|地域|県|国|山|川|平野))'),
-            re.compile(r'^(図中の|表中の|グラフ中の)(?!.*?(読み取|分析|説明))'),
-            # アルファベット・記号での場所指定
-            re.compile(r'^[A-Z]([地点|地域|都市|県|国])'),
-            re.compile(r'^[ア-ン]([地点|地域|都市|県|国])'),
-            
-            # === 時間・順序関係（文脈依存） ===
-            re.compile(r'^(その後|それ以降|以前|以後|同時期|当該期間)'),
-            re.compile(r'^第[一二三四五六七八九十]期'),
-            
-            # === 不完全な固有名詞 ===
-            # 〜県の特徴（県名が具体的でない場合）
-            re.compile(r'^この(県|府|道|都|地方|地域)の'),
-            # A国、B国のような抽象的表現
-            re.compile(r'^[A-Z]国'),
-
-            # === その他の参照テキスト（内容が不十分）===
-            # 新聞記事の内容など、教材参照のみの断片
-            re.compile(r'新聞記事の内容'),
-            # 「以下の表」を含むが読み取り等が無い場合は除外
-            re.compile(r'以下の表(?!.*?(読み取|分析|説明))$'),
-        ]
+    def _init_exclusion_patterns(self) -> List[_sre.Pattern]:
+        """除外すべきパターン（強化版・モジュールスコープで事前コンパイル済み）"""
+        return list(_EXCLUSION_PATTERNS)
     
     def extract(self, text: str) -> ExtractedTheme:
+        """テーマを抽出するメインメソッド（結果はLRUキャッシュされる）"""
+        return self._extract_cached(text)
+
+    def _extract_impl(self, text: str) -> ExtractedTheme:
         """
-        テーマを抽出するメインメソッド
+        テーマを抽出する本体
         
         階層的アプローチ:
         1. 用語カタログからのテーマ抽出（最優先）
@@ -474,33 +574,39 @@ class ThemeExtractorV2:
             
         return self._fallback_extraction(text)
 
+    def extract_batch(self, texts: List[str],
+                      max_workers: Optional[int] = None) -> List[ExtractedTheme]:
+        """
+        複数テキストのテーマを一括抽出する
+
+        Python ループ側の属性参照・ディスパッチのオーバーヘッドを
+        呼び出し1回に集約する。結果は入力と同じ順序で返す。
+
+        max_workers を指定するとスレッドで並列化する（抽出器は読み取り
+        専用の共有状態のみ持つためスレッドセーフ）。
+        """
+        extract = self.extract  # ループ内の属性参照を回避
+        if max_workers and max_workers > 1 and len(texts) > 1:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(texts))) as executor:
+                return list(executor.map(extract, texts))
+        return [extract(text) for text in texts]
+
     def _refine_theme_from_keywords(self, text: str) -> Optional[ExtractedTheme]:
         """キーワードから具体的なテーマを生成"""
-        import re
         
         # デバッグ: テキストの内容を確認
         # logger.debug(f"_refine_theme_from_keywords: text='{text}'")
         
-        # まず特定のキーワードを直接マッチング
-        if '鎌倉幕府' in text:
-            # logger.debug("鎌倉幕府マッチ!")
-            return ExtractedTheme('鎌倉幕府の成立', '歴史', 0.9)
-        if '室町幕府' in text:
-            return ExtractedTheme('室町幕府の政治', '歴史', 0.9)
-        if '江戸幕府' in text or '徳川幕府' in text:
-            return ExtractedTheme('江戸幕府の政治', '歴史', 0.9)
-        if '江戸時代' in text:
+        # まず特定のキーワードを直接マッチング（結合パターン1回の走査）
+        hit = _first_hit(_DIRECT_THEME_RE, [k for k, _ in _DIRECT_THEMES], text)
+        if hit == '江戸時代':
             if '身分' in text:
                 return ExtractedTheme('江戸時代の身分制度', '歴史', 0.95)
             return ExtractedTheme('江戸時代の特徴', '歴史', 0.9)
-        if '明治維新' in text:
-            return ExtractedTheme('明治維新の改革', '歴史', 0.9)
-        if '大日本帝国憲法' in text:
-            return ExtractedTheme('大日本帝国憲法の内容', '歴史', 0.9)
-        if '日本国憲法' in text:
-            return ExtractedTheme('日本国憲法の内容', '公民', 0.9)
-        if '人口ピラミッド' in text:
-            return ExtractedTheme('人口ピラミッドの分析', '地理', 0.95)
+        if hit is not None:
+            spec = dict(_DIRECT_THEMES)[hit]
+            return ExtractedTheme(*spec)
         
         # 年度・西暦の処理
         m_year = re.search(r'(\d{4})年', text)
@@ -520,18 +626,9 @@ class ThemeExtractorV2:
             return ExtractedTheme(f'{year}年の出来事', '総合', 0.6)
 
         # 公民の代表用語（より具体化）
-        civics_map = [
-            ('プライバシー', 'プライバシーの権利'),
-            ('オンブズマン', 'オンブズマン制度の仕組み'),
-            ('国土交通省', '国土交通省の役割'),
-            ('市町村合併', '市町村合併の目的'),
-            ('合併', '市町村合併の目的'),
-            ('裁判員', '裁判員制度の仕組み'),
-            ('個人情報', '個人情報保護の仕組み'),
-        ]
-        for key, theme in civics_map:
-            if key in text:
-                return ExtractedTheme(theme, '公民', 0.9)
+        hit = _first_hit(_CIVICS_THEME_RE, [k for k, _ in _CIVICS_THEMES], text)
+        if hit is not None:
+            return ExtractedTheme(dict(_CIVICS_THEMES)[hit], '公民', 0.9)
 
         # 数字のみ参照の除外（例: 「12について」）
         if re.fullmatch(r'\s*\d{1,3}\s*(について)?\s*', text):
@@ -566,24 +663,21 @@ class ThemeExtractorV2:
                     return ExtractedTheme(f'{person}の業績', '歴史', 0.85)
         
         # 重要な事件・出来事
-        events = ['大化の改新', '承久の乱', '応仁の乱', '本能寺の変', '関ヶ原の戦い', 
-                 '明治維新', '太平洋戦争', '日露戦争', '第一次世界大戦', '第二次世界大戦']
-        for event in events:
-            if event in text:
-                return ExtractedTheme(event, '歴史', 0.9)
-        
+        event = _first_hit(_HISTORY_EVENT_RE, _HISTORY_EVENTS, text)
+        if event is not None:
+            return ExtractedTheme(event, '歴史', 0.9)
+
         # 地理的特徴
         # 国名の具体化
-        countries = ['フィリピン', 'ウルグアイ', 'ブラジル', 'アメリカ合衆国', 'アメリカ', '中国', 'インド']
-        for c in countries:
-            if c in text:
-                if any(k in text for k in ['産業', '工業', '農業', '貿易']):
-                    return ExtractedTheme(f'{c}の産業', '地理', 0.8)
-                if any(k in text for k in ['人口', '少子', '高齢']):
-                    return ExtractedTheme(f'{c}の人口', '地理', 0.75)
-                if any(k in text for k in ['気候', '雨温図']):
-                    return ExtractedTheme(f'{c}の気候', '地理', 0.75)
-                return ExtractedTheme(f'{c}の地理的特徴', '地理', 0.75)
+        c = _first_hit(_COUNTRY_RE, _COUNTRIES, text)
+        if c is not None:
+            if any(k in text for k in ['産業', '工業', '農業', '貿易']):
+                return ExtractedTheme(f'{c}の産業', '地理', 0.8)
+            if any(k in text for k in ['人口', '少子', '高齢']):
+                return ExtractedTheme(f'{c}の人口', '地理', 0.75)
+            if any(k in text for k in ['気候', '雨温図']):
+                return ExtractedTheme(f'{c}の気候', '地理', 0.75)
+            return ExtractedTheme(f'{c}の地理的特徴', '地理', 0.75)
         if '人口ピラミッド' in text:
             return ExtractedTheme('人口ピラミッドの分析', '地理', 0.9)
         if '雨温図' in text:
@@ -597,7 +691,6 @@ class ThemeExtractorV2:
 
     def _match_options_cluster(self, text: str) -> Optional[ExtractedTheme]:
         """ア/イ/ウ/エ の選択肢から強いテーマ候補を推定"""
-        import re
         options: List[str] = []
         # 代表的な選択肢フォーマット（全角/半角ドット/カッコ/コロン/読点等）
         patterns = [
@@ -605,7 +698,8 @@ class ThemeExtractorV2:
             re.compile(r'[（(]?([アイウエ])[）)]?[\s\.:：、,，)]\s*([^\n\r]+)'),
             re.compile(r'[（(]?([あいうえ])[）)]?[\s\.:：、,，)]\s*([^\n\r]+)'),
             # 区切り弱いOCR崩れ: 行頭カタカナ + 空白 + 文章
-            re.compile(r'^[\s　]*([アイウエ])\s+([^\n\r]+)', re.MULTILINE),
+            # （MULTILINEはインラインフラグ。re2はフラグ引数を持たない）
+            re.compile(r'(?m)^[\s　]*([アイウエ])\s+([^\n\r]+)'),
         ]
         for pat in patterns:
             for m in pat.finditer(text):
@@ -685,7 +779,21 @@ class ThemeExtractorV2:
         if len(cleaned_text) <= 2:
             return True
         
+        # リテラル語句は Aho-Corasick オートマトンで先行判定（利用可能な場合）
+        if _EXCLUSION_AUTOMATON is not None:
+            hit = next(_EXCLUSION_AUTOMATON.iter(cleaned_text), None)
+            if hit is not None:
+                try:
+                    logger.info(f"テーマ除外: literal='{hit[1]}' text='{cleaned_text[:40]}...'")
+                except Exception:
+                    pass
+                return True
+
         # 除外パターンにマッチ
+        # まず結合パターンで一次スキャンし、非該当なら即座に抜ける
+        if _EXCLUSION_SCAN.search(cleaned_text) is None:
+            return False
+
         for pattern in self.exclusion_patterns:
             if pattern.search(cleaned_text):
                 try:
@@ -763,7 +871,6 @@ class ThemeExtractorV2:
     
     def _fallback_extraction(self, text: str) -> ExtractedTheme:
         """フォールバック: 最も重要なキーワードを抽出して2文節化"""
-        import re
 
         # 特殊な資料読み取り問題の処理
         if '地図中' in text and ('都市' in text or '地域' in text or '県' in text):
@@ -3,13 +3,22 @@
 大問→問→小問の3層構造を正確に認識
 """
 
-import re
+# 正規表現エンジン：google-re2があれば線形時間のDFA照合を使う
+# （OCRノイズでのバックトラック爆発を避けられる）。無ければ標準re
+try:
+    import re2 as re
+except ImportError:
+    import re
 from typing import List, Dict, Tuple, Optional
 from dataclasses import dataclass, field
 
-@dataclass
+@dataclass(slots=True)
 class Question:
-    """個別の問題を表すデータクラス"""
+    """個別の問題を表すデータクラス
+
+    1試験あたり数千インスタンス生成されるため__dict__を持たせず、
+    属性アクセスをスロット参照にする（childrenを差し替えるので非frozen）
+    """
     level: str  # 'major', 'question', 'subquestion'
     number: str  # 問題番号
     text: str  # 問題文（最初の100文字）
@@ -78,7 +87,38 @@ class HierarchicalExtractor:
             '⑪': '11', '⑫': '12', '⑬': '13', '⑭': '14', '⑮': '15',
             '⑯': '16', '⑰': '17', '⑱': '18', '⑲': '19', '⑳': '20'
         }
-    
+
+        # 各レベルのパターンを1本の選択肢付き正規表現に統合し、
+        # テキスト走査をレベルごとに1回で済ませる
+        self._major_re, self._major_inner = self._combine_patterns(self.major_patterns)
+        self._question_re, self._question_inner = self._combine_patterns(self.question_patterns)
+        self._subquestion_re, self._subquestion_inner = self._combine_patterns(self.subquestion_patterns)
+
+    @staticmethod
+    def _combine_patterns(patterns):
+        """(パターン, マーカー名)の一覧を1本の正規表現にまとめる
+
+        Returns:
+            (コンパイル済み正規表現,
+             マーカー名→番号捕捉グループのインデックス)
+        """
+        # MULTILINEはインラインフラグで指定する
+        # （re2モジュールはフラグ定数・flags引数を持たない）
+        combined = re.compile(
+            '(?m)' + '|'.join(f'(?P<{name}>{pat})' for pat, name in patterns))
+        # 各選択肢の内側にある捕捉グループは、外側の名前付きグループの
+        # 直後の番号になる
+        inner = {name: combined.groupindex[name] + 1 for _, name in patterns}
+        return combined, inner
+
+    @staticmethod
+    def _matched_marker(match):
+        """どの選択肢がマッチしたか（マーカー名）を返す"""
+        for name, value in match.groupdict().items():
+            if value is not None:
+                return name
+        return None
+
     def extract_structure(self, text: str) -> List[Question]:
         """
         テキストから階層的な問題構造を抽出
@@ -118,21 +158,18 @@ class HierarchicalExtractor:
     def _extract_major_questions(self, text: str) -> List[Question]:
         """大問を抽出"""
         major_questions = []
-        
-        for pattern, marker_type in self.major_patterns:
-            for match in re.finditer(pattern, text, re.MULTILINE):
-                number = self._normalize_number(match.group(1))
-                major_questions.append(Question(
-                    level='major',
-                    number=number,
-                    text=self._get_preview_text(text, match.end(), 100),
-                    position=match.span(),
-                    marker_type=marker_type
-                ))
-        
-        # 位置でソート
-        major_questions.sort(key=lambda x: x.position[0])
-        
+
+        for match in self._major_re.finditer(text):
+            marker_type = self._matched_marker(match)
+            number = self._normalize_number(match.group(self._major_inner[marker_type]))
+            major_questions.append(Question(
+                level='major',
+                number=number,
+                text=self._get_preview_text(text, match.end(), 100),
+                position=match.span(),
+                marker_type=marker_type
+            ))
+
         # 重複を除去（位置が近いものは最初のものを採用）
         filtered = []
         for q in major_questions:
@@ -144,20 +181,18 @@ class HierarchicalExtractor:
     def _extract_questions(self, text: str, offset: int) -> List[Question]:
         """問（中レベル）を抽出"""
         questions = []
-        
-        for pattern, marker_type in self.question_patterns:
-            for match in re.finditer(pattern, text, re.MULTILINE):
-                number = self._normalize_number(match.group(1))
-                questions.append(Question(
-                    level='question',
-                    number=number,
-                    text=self._get_preview_text(text, match.end(), 100),
-                    position=(match.start() + offset, match.end() + offset),
-                    marker_type=marker_type
-                ))
-        
-        questions.sort(key=lambda x: x.position[0])
-        
+
+        for match in self._question_re.finditer(text):
+            marker_type = self._matched_marker(match)
+            number = self._normalize_number(match.group(self._question_inner[marker_type]))
+            questions.append(Question(
+                level='question',
+                number=number,
+                text=self._get_preview_text(text, match.end(), 100),
+                position=(match.start() + offset, match.end() + offset),
+                marker_type=marker_type
+            ))
+
         # 重複除去
         filtered = []
         for q in questions:
@@ -169,20 +204,18 @@ class HierarchicalExtractor:
     def _extract_subquestions(self, text: str, offset: int) -> List[Question]:
         """小問を抽出"""
         subquestions = []
-        
-        for pattern, marker_type in self.subquestion_patterns:
-            for match in re.finditer(pattern, text):
-                number = self._normalize_number(match.group(1))
-                subquestions.append(Question(
-                    level='subquestion',
-                    number=number,
-                    text=self._get_preview_text(text, match.end(), 50),
-                    position=(match.start() + offset, match.end() + offset),
-                    marker_type=marker_type
-                ))
-        
-        subquestions.sort(key=lambda x: x.position[0])
-        
+
+        for match in self._subquestion_re.finditer(text):
+            marker_type = self._matched_marker(match)
+            number = self._normalize_number(match.group(self._subquestion_inner[marker_type]))
+            subquestions.append(Question(
+                level='subquestion',
+                number=number,
+                text=self._get_preview_text(text, match.end(), 50),
+                position=(match.start() + offset, match.end() + offset),
+                marker_type=marker_type
+            ))
+
         # 重複除去
         filtered = []
         for q in subquestions:
@@ -259,21 +292,38 @@ class HierarchicalExtractor:
             レベル別の問題数
         """
         counts = {
-            'major': len(structure),
+            'major': 0,
             'question': 0,
             'subquestion': 0,
-            'total': len(structure)
+            'total': 0
         }
-        
-        for major in structure:
-            counts['question'] += len(major.children)
-            counts['total'] += len(major.children)
-            
-            for question in major.children:
-                counts['subquestion'] += len(question.children)
-                counts['total'] += len(question.children)
-        
+        level_keys = ('major', 'question', 'subquestion')
+
+        for node, level in self._walk(structure):
+            counts[level_keys[min(level, 2)]] += 1
+            counts['total'] += 1
+
         return counts
+
+    @staticmethod
+    def _walk(roots: List[Question]):
+        """(ノード, 階層)を行きがけ順でyieldする反復DFS
+
+        (兄弟リスト, 次のインデックス)のフレームを積むだけなので、
+        ノードごとの中間リストやイテレータを確保せず、ネスト段数にも
+        依存しない
+        """
+        stack = [(roots, 0)]
+        while stack:
+            siblings, i = stack[-1]
+            if i >= len(siblings):
+                stack.pop()
+                continue
+            node = siblings[i]
+            stack[-1] = (siblings, i + 1)
+            yield node, len(stack) - 1
+            if node.children:
+                stack.append((node.children, 0))
     
     def format_structure(self, structure: List[Question]) -> str:
         """
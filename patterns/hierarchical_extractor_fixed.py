@@ -8,9 +8,13 @@ import re
 from typing import List, Dict, Tuple, Optional
 from dataclasses import dataclass, field
 
-@dataclass
+@dataclass(slots=True)
 class Question:
-    """個別の問題を表すデータクラス"""
+    """個別の問題を表すデータクラス
+
+    1試験あたり数千インスタンス生成されるため__dict__を持たせず、
+    属性アクセスをスロット参照にする（childrenを差し替えるので非frozen）
+    """
     level: str  # 'major', 'question', 'subquestion'
     number: str  # 問題番号
     text: str  # 問題文（最初の100文字）
@@ -110,6 +114,37 @@ class HierarchicalExtractorFixed:
         
         # コンパイル済み除外パターン
         self.compiled_exclusions = [re.compile(pattern) for pattern in self.exclusion_patterns]
+
+        # 各レベルのパターンを1本の選択肢付き正規表現に束ねる。
+        # パターンごとにテキスト全体を走査し直す代わりに、レベルあたり
+        # 1回のfinditerで全マーカーを拾う
+        self._major_re, self._major_inner = self._combine_patterns(self.major_patterns)
+        self._question_re, self._question_inner = self._combine_patterns(self.question_patterns)
+        self._subquestion_re, self._subquestion_inner = self._combine_patterns(self.subquestion_patterns)
+
+    @staticmethod
+    def _combine_patterns(patterns):
+        """(パターン, マーカー名)の一覧を1本の正規表現にまとめる
+
+        Returns:
+            (コンパイル済み正規表現,
+             マーカー名→番号捕捉グループのインデックス)
+        """
+        combined = re.compile(
+            '|'.join(f'(?P<{name}>{pat})' for pat, name in patterns),
+            re.MULTILINE)
+        # 各選択肢の内側にある捕捉グループは、外側の名前付きグループの
+        # 直後の番号になる（グループを持たないパターンでは使わないこと）
+        inner = {name: combined.groupindex[name] + 1 for _, name in patterns}
+        return combined, inner
+
+    @staticmethod
+    def _matched_marker(match):
+        """どの選択肢がマッチしたか（マーカー名）を返す"""
+        for name, value in match.groupdict().items():
+            if value is not None:
+                return name
+        return None
     
     def extract_structure(self, text: str) -> List[Question]:
         """
@@ -202,32 +237,35 @@ class HierarchicalExtractorFixed:
     def _extract_major_questions(self, text: str) -> List[Question]:
         """大問を抽出（修正版）"""
         major_questions = []
-        
-        for pattern, marker_type in self.major_patterns:
-            for match in re.finditer(pattern, text, re.MULTILINE):
-                # 除外パターンのチェック
-                if self._should_exclude(text, match.start(), match.end()):
-                    continue
-                
-                # OCRエラー対応：具体的パターン
-                if marker_type == 'nitkkoma_13_to_3':
-                    number = '3'
-                elif marker_type == 'nitkkoma_14_to_4':
-                    number = '4'
-                else:
-                    number = self._normalize_number(match.group(1))
-                    if marker_type == 'nitkkoma_ocr_error':
-                        number = match.group(1)  # 2桁目を使用
-                
-                major_questions.append(Question(
-                    level='major',
-                    number=number,
-                    text=self._get_preview_text(text, match.end(), 100),
-                    position=match.span(),
-                    marker_type=marker_type
-                ))
-        
-        # 位置でソート
+
+        for match in self._major_re.finditer(text):
+            marker_type = self._matched_marker(match)
+
+            # 除外パターンのチェック
+            if self._should_exclude(text, match.start(), match.end()):
+                continue
+
+            # OCRエラー対応：具体的パターン
+            if marker_type == 'nitkkoma_13_to_3':
+                number = '3'
+            elif marker_type == 'nitkkoma_14_to_4':
+                number = '4'
+            else:
+                captured = match.group(self._major_inner[marker_type])
+                number = self._normalize_number(captured)
+                if marker_type == 'nitkkoma_ocr_error':
+                    number = captured  # 2桁目を使用
+
+            major_questions.append(Question(
+                level='major',
+                number=number,
+                text=self._get_preview_text(text, match.end(), 100),
+                position=match.span(),
+                marker_type=marker_type
+            ))
+
+        # finditerは位置順に返すが、後段の重複除去の前提を明示するため
+        # 念のためソートしておく
         major_questions.sort(key=lambda x: x.position[0])
         
         # 重複を除去（位置が近いものは最初のものを採用）
@@ -262,48 +300,49 @@ class HierarchicalExtractorFixed:
         seen_positions = set()
         seen_numbers = {}  # 問番号 → 位置のマッピング
         
-        for pattern, marker_type in self.question_patterns:
-            for match in re.finditer(pattern, text, re.MULTILINE):
-                # 除外パターンのチェック
-                if self._should_exclude(text, match.start() + offset, match.end() + offset):
-                    continue
-                
-                # 位置の重複チェック（同じ位置の複数マッチを防ぐ）
-                pos = match.start() + offset
-                if any(abs(pos - seen_pos) < 3 for seen_pos in seen_positions):  # 3文字以内は重複
+        for match in self._question_re.finditer(text):
+            marker_type = self._matched_marker(match)
+
+            # 除外パターンのチェック
+            if self._should_exclude(text, match.start() + offset, match.end() + offset):
+                continue
+
+            # 位置の重複チェック（同じ位置の複数マッチを防ぐ）
+            pos = match.start() + offset
+            if any(abs(pos - seen_pos) < 3 for seen_pos in seen_positions):  # 3文字以内は重複
+                continue
+
+            number = self._normalize_number(match.group(self._question_inner[marker_type]))
+
+            # 同一大問内での問番号重複チェック
+            question_key = f"{major_number}-{number}"
+            if question_key in seen_numbers:
+                # 同じ問番号が複数回出現する場合、位置が十分離れていれば別の問として扱う
+                previous_pos = seen_numbers[question_key]
+                if abs(pos - previous_pos) < 300:  # 300文字以内なら重複として除外
                     continue
-                
-                number = self._normalize_number(match.group(1))
-                
-                # 同一大問内での問番号重複チェック
-                question_key = f"{major_number}-{number}"
-                if question_key in seen_numbers:
-                    # 同じ問番号が複数回出現する場合、位置が十分離れていれば別の問として扱う
-                    previous_pos = seen_numbers[question_key]
-                    if abs(pos - previous_pos) < 300:  # 300文字以内なら重複として除外
-                        continue
-                
-                seen_numbers[question_key] = pos
-                
-                # 有効な問番号のみ（1-20の範囲）
-                try:
-                    num_val = int(number)
-                    if not (1 <= num_val <= 20):
-                        continue
-                except ValueError:
+
+            seen_numbers[question_key] = pos
+
+            # 有効な問番号のみ（1-20の範囲）
+            try:
+                num_val = int(number)
+                if not (1 <= num_val <= 20):
                     continue
-                
-                question = Question(
-                    level='question',
-                    number=number,
-                    text=self._get_preview_text(text, match.end(), 100),
-                    position=(match.start() + offset, match.end() + offset),
-                    marker_type=marker_type
-                )
-                
-                questions.append(question)
-                seen_positions.add(pos)
-        
+            except ValueError:
+                continue
+
+            question = Question(
+                level='question',
+                number=number,
+                text=self._get_preview_text(text, match.end(), 100),
+                position=(match.start() + offset, match.end() + offset),
+                marker_type=marker_type
+            )
+
+            questions.append(question)
+            seen_positions.add(pos)
+
         questions.sort(key=lambda x: x.position[0])
         
         # 連続した同じ番号の問題を除去（括弧形式の問題で重複検出されやすい）
@@ -325,16 +364,17 @@ class HierarchicalExtractorFixed:
         """小問を抽出"""
         subquestions = []
         
-        for pattern, marker_type in self.subquestion_patterns:
-            for match in re.finditer(pattern, text):
-                number = self._normalize_number(match.group(1))
-                subquestions.append(Question(
-                    level='subquestion',
-                    number=number,
-                    text=self._get_preview_text(text, match.end(), 50),
-                    position=(match.start() + offset, match.end() + offset),
-                    marker_type=marker_type
-                ))
+        for match in self._subquestion_re.finditer(text):
+            marker_type = self._matched_marker(match)
+            number = self._normalize_number(
+                match.group(self._subquestion_inner[marker_type]))
+            subquestions.append(Question(
+                level='subquestion',
+                number=number,
+                text=self._get_preview_text(text, match.end(), 50),
+                position=(match.start() + offset, match.end() + offset),
+                marker_type=marker_type
+            ))
         
         subquestions.sort(key=lambda x: x.position[0])
         
@@ -424,21 +464,38 @@ class HierarchicalExtractorFixed:
             レベル別の問題数
         """
         counts = {
-            'major': len(structure),
+            'major': 0,
             'question': 0,
             'subquestion': 0,
-            'total': len(structure)
+            'total': 0
         }
-        
-        for major in structure:
-            counts['question'] += len(major.children)
-            counts['total'] += len(major.children)
-            
-            for question in major.children:
-                counts['subquestion'] += len(question.children)
-                counts['total'] += len(question.children)
-        
+        level_keys = ('major', 'question', 'subquestion')
+
+        for node, level in self._walk(structure):
+            counts[level_keys[min(level, 2)]] += 1
+            counts['total'] += 1
+
         return counts
+
+    @staticmethod
+    def _walk(roots: List[Question]):
+        """(ノード, 階層)を行きがけ順でyieldする反復DFS
+
+        (兄弟リスト, 次のインデックス)のフレームを積むだけなので、
+        ノードごとの中間リストやイテレータを確保せず、ネスト段数にも
+        依存しない
+        """
+        stack = [(roots, 0)]
+        while stack:
+            siblings, i = stack[-1]
+            if i >= len(siblings):
+                stack.pop()
+                continue
+            node = siblings[i]
+            stack[-1] = (siblings, i + 1)
+            yield node, len(stack) - 1
+            if node.children:
+                stack.append((node.children, 0))
     
     def _reassign_misplaced_questions(self, major_questions: List[Question]) -> List[Question]:
         """
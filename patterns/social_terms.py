@@ -228,69 +228,61 @@ CURRENT_AFFAIRS_TERMS = [
     'G7サミット', 'G20', 'COP', '気候変動会議'
 ]
 
+# 用語→(分野, カテゴリー)の平坦な索引。モジュール読み込み時に1回だけ
+# 構築し、照合のたびに分野別辞書を歩き直さないようにする。
+# 複数分野に現れる用語は最初の定義が優先される（従来の重複除去と同じ）
+_TERM_INDEX = {}
+for _field, _categories in (('地理', GEOGRAPHY_TERMS),
+                            ('歴史', HISTORY_TERMS),
+                            ('公民', CIVICS_TERMS)):
+    for _category, _terms in _categories.items():
+        for _term in _terms:
+            _TERM_INDEX.setdefault(_term, (_field, _category))
+for _term in CURRENT_AFFAIRS_TERMS:
+    _TERM_INDEX.setdefault(_term, ('時事', '時事問題'))
+
+# pyahocorasickが入っていれば、全用語をオートマトン化して
+# テキストを1回の線形走査で照合する（用語数×テキスト長→テキスト長）
+try:
+    import ahocorasick
+    _TERM_AUTOMATON = ahocorasick.Automaton()
+    for _term in _TERM_INDEX:
+        _TERM_AUTOMATON.add_word(_term, _term)
+    _TERM_AUTOMATON.make_automaton()
+except ImportError:
+    _TERM_AUTOMATON = None
+
+
 def extract_important_terms(text):
     """
     テキストから重要な社会科用語を抽出
-    
+
     Args:
         text: 分析対象のテキスト
-        
+
     Returns:
         抽出された重要用語のリスト
     """
-    found_terms = []
-    
-    # 地理用語をチェック
-    for category, terms in GEOGRAPHY_TERMS.items():
-        for term in terms:
-            if term in text:
-                found_terms.append({
-                    'term': term,
-                    'field': '地理',
-                    'category': category,
-                    'count': text.count(term)
-                })
-    
-    # 歴史用語をチェック
-    for category, terms in HISTORY_TERMS.items():
-        for term in terms:
-            if term in text:
-                found_terms.append({
-                    'term': term,
-                    'field': '歴史',
-                    'category': category,
-                    'count': text.count(term)
-                })
-    
-    # 公民用語をチェック
-    for category, terms in CIVICS_TERMS.items():
-        for term in terms:
-            if term in text:
-                found_terms.append({
-                    'term': term,
-                    'field': '公民',
-                    'category': category,
-                    'count': text.count(term)
-                })
-    
-    # 時事用語をチェック
-    for term in CURRENT_AFFAIRS_TERMS:
-        if term in text:
-            found_terms.append({
-                'term': term,
-                'field': '時事',
-                'category': '時事問題',
-                'count': text.count(term)
-            })
-    
-    # 重複を除去し、出現回数でソート
-    unique_terms = {}
-    for item in found_terms:
-        key = item['term']
-        if key not in unique_terms or item['count'] > unique_terms[key]['count']:
-            unique_terms[key] = item
-    
-    return sorted(unique_terms.values(), key=lambda x: x['count'], reverse=True)
+    # ヒットした用語の集合を求める。オートマトンがあれば1パス、
+    # なければ索引を1周してin判定（従来の4重ループよりは1本化）
+    if _TERM_AUTOMATON is not None:
+        matched = {term for _, term in _TERM_AUTOMATON.iter(text)}
+    else:
+        matched = {term for term in _TERM_INDEX if term in text}
+
+    # 出現回数は見つかった用語に対してだけ数える。
+    # 索引順に組み立てて、同数時の並びを従来と一致させる
+    found_terms = [
+        {
+            'term': term,
+            'field': _TERM_INDEX[term][0],
+            'category': _TERM_INDEX[term][1],
+            'count': text.count(term),
+        }
+        for term in _TERM_INDEX if term in matched
+    ]
+
+    return sorted(found_terms, key=lambda x: x['count'], reverse=True)
 
 def get_themes_from_terms(terms_list, top_n=10):
     """
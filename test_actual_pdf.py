@@ -5,7 +5,12 @@
 
 import sys
 import os
+import heapq
 import logging
+import operator
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
@@ -33,29 +38,32 @@ def analyze_pdf(pdf_path):
     print(f"ファイル: {Path(pdf_path).name}")
     print("=" * 60)
     
-    # 各モジュールの初期化
-    analyzer = SocialAnalyzer()
-    formatter = SocialExcelFormatter()
-    ocr_handler = OCRHandler()
-    theme_refiner = ThemeRefiner()
+    # 各モジュールの初期化（互いに独立なので、辞書・モデル読み込みを
+    # スレッドで重ね合わせてコールドスタートを短縮する）
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(cls) for cls in
+                   (SocialAnalyzer, SocialExcelFormatter, OCRHandler, ThemeRefiner)]
+        analyzer, formatter, ocr_handler, theme_refiner = (f.result() for f in futures)
     
     try:
-        # PDFからテキスト抽出
-        print("\n1. PDFからテキストを抽出中...")
-        text = ocr_handler.process_pdf(pdf_path)
-        
-        if not text:
+        # PDFからページ単位でテキストを抽出しつつ、階層抽出に逐次投入する
+        # （全文を先に確定させず、抽出器はページごとのテキストだけを走査する）
+        print("\n1-2. ページ単位でテキスト抽出と問題の階層抽出を実行中...")
+        hierarchy_manager = HierarchicalQuestionManager()
+        pages = []
+        for page_text in ocr_handler.process_pdf_iter(pdf_path):
+            hierarchy_manager.feed_page(page_text)
+            pages.append(page_text)  # 後段の文書分析で必要
+
+        if not pages:
             print("❌ テキストの抽出に失敗しました")
             return None
-            
+
+        text = '\n'.join(pages)
         print(f"✅ テキスト抽出完了（{len(text)}文字）")
-        
-        # 階層的な問題番号管理システムで問題を抽出
-        print("\n2. 問題を階層構造で抽出中...")
-        hierarchy_manager = HierarchicalQuestionManager()
-        hierarchical_questions = hierarchy_manager.extract_hierarchical_questions(text)
-        flattened_questions = hierarchy_manager.get_flattened_questions()
-        
+
+        flattened_questions = hierarchy_manager.finalize()
+
         print(f"✅ {len(flattened_questions)}個の問題を検出")
         
         # 分析実行
@@ -115,7 +123,6 @@ def analyze_pdf(pdf_path):
     except Exception as e:
         logger.error(f"分析エラー: {e}")
         print(f"\n❌ エラーが発生しました: {e}")
-        import traceback
         traceback.print_exc()
         return None
 
@@ -124,79 +131,90 @@ def display_results(analysis_result):
     if not analysis_result:
         print("\n分析結果がありません")
         return
-    
-    print("\n" + "=" * 60)
-    print("分析結果サマリー")
-    print("=" * 60)
-    
-    print(f"\n総問題数: {analysis_result.get('total_questions', 0)}問")
-    
+
+    # print() を行ごとに発行すると都度 stdout のロック/フラッシュが走るため、
+    # 行バッファに貯めて最後に1回で書き出す
+    out = []
+    out.append("\n" + "=" * 60)
+    out.append("分析結果サマリー")
+    out.append("=" * 60)
+
+    out.append(f"\n総問題数: {analysis_result.get('total_questions', 0)}問")
+
+    # SocialQuestion はデータクラスで全属性にデフォルトがあるため、
+    # per-question の hasattr/getattr プローブは1回バインドの attrgetter で置き換える
+    get_attrs = operator.attrgetter('number', 'theme', 'field')
+
     if 'statistics' not in analysis_result:
-        print("\n⚠️ 統計情報が不完全です")
+        out.append("\n⚠️ 統計情報が不完全です")
         if 'questions' in analysis_result:
-            print("\n検出された問題（最初の10問）:")
-            for i, q in enumerate(analysis_result['questions'][:10], 1):
-                num = getattr(q, 'number', f'問題{i}')
-                theme = getattr(q, 'theme', '（テーマなし）')
-                print(f"  {num}: {theme}")
+            out.append("\n検出された問題（最初の10問）:")
+            for q in analysis_result['questions'][:10]:
+                num, theme, _ = get_attrs(q)
+                out.append(f"  {num}: {theme or '（テーマなし）'}")
+        sys.stdout.write("\n".join(out) + "\n")
         return
-    
+
     stats = analysis_result['statistics']
-    
+
     # 分野別分布
-    print("\n【分野別出題状況】")
+    out.append("\n【分野別出題状況】")
     if 'field_distribution' in stats and stats['field_distribution']:
-        for field, data in stats['field_distribution'].items():
-            if isinstance(data, dict) and 'count' in data and 'percentage' in data:
-                print(f"  {field:8s}: {data['count']:3d}問 ({data['percentage']:5.1f}%)")
+        out.extend(
+            f"  {field:8s}: {data['count']:3d}問 ({data['percentage']:5.1f}%)"
+            for field, data in stats['field_distribution'].items()
+            if isinstance(data, dict) and 'count' in data and 'percentage' in data
+        )
     else:
-        print("  （データなし）")
-    
+        out.append("  （データなし）")
+
     # 資料活用状況
-    print("\n【資料活用状況】")
+    out.append("\n【資料活用状況】")
     if 'resource_usage' in stats and stats['resource_usage']:
         valid_resources = [(k, v) for k, v in stats['resource_usage'].items() 
                           if isinstance(v, dict) and 'count' in v]
         if valid_resources:
-            for resource, data in sorted(valid_resources, 
-                                        key=lambda x: x[1].get('count', 0), 
-                                        reverse=True)[:5]:
-                print(f"  {resource:10s}: {data['count']:3d}回 ({data['percentage']:5.1f}%)")
+            out.extend(
+                f"  {resource:10s}: {data['count']:3d}回 ({data['percentage']:5.1f}%)"
+                for resource, data in heapq.nlargest(
+                    5, valid_resources, key=lambda x: x[1].get('count', 0))
+            )
     else:
-        print("  （データなし）")
-    
+        out.append("  （データなし）")
+
     # 出題形式
-    print("\n【出題形式分布】")
+    out.append("\n【出題形式分布】")
     if 'format_distribution' in stats and stats['format_distribution']:
         valid_formats = [(k, v) for k, v in stats['format_distribution'].items() 
                         if isinstance(v, dict) and 'count' in v]
         if valid_formats:
-            for format_type, data in sorted(valid_formats,
-                                           key=lambda x: x[1].get('count', 0),
-                                           reverse=True)[:5]:
-                print(f"  {format_type:10s}: {data['count']:3d}問 ({data['percentage']:5.1f}%)")
+            out.extend(
+                f"  {format_type:10s}: {data['count']:3d}問 ({data['percentage']:5.1f}%)"
+                for format_type, data in heapq.nlargest(
+                    5, valid_formats, key=lambda x: x[1].get('count', 0))
+            )
     else:
-        print("  （データなし）")
-    
+        out.append("  （データなし）")
+
     # 時事問題
-    print("\n【時事問題】")
+    out.append("\n【時事問題】")
     if 'current_affairs' in stats and isinstance(stats['current_affairs'], dict):
         count = stats['current_affairs'].get('count', 0)
         percentage = stats['current_affairs'].get('percentage', 0)
-        print(f"  時事問題数: {count}問 ({percentage:.1f}%)")
+        out.append(f"  時事問題数: {count}問 ({percentage:.1f}%)")
     else:
-        print("  （データなし）")
-    
+        out.append("  （データなし）")
+
     # 問題とテーマのサンプル表示
     if 'questions' in analysis_result and analysis_result['questions']:
-        print("\n【検出された問題とテーマ（最初の10問）】")
-        for i, q in enumerate(analysis_result['questions'][:10], 1):
-            num = getattr(q, 'number', f'問題{i}')
-            theme = getattr(q, 'theme', '（テーマなし）')
-            field = getattr(q, 'field', '')
-            if hasattr(field, 'value'):
+        out.append("\n【検出された問題とテーマ（最初の10問）】")
+        for q in analysis_result['questions'][:10]:
+            num, theme, field = get_attrs(q)
+            if isinstance(field, Enum):
                 field = field.value
-            print(f"  {num}: [{field}] {theme}")
+            out.append(f"  {num}: [{field or ''}] {theme or '（テーマなし）'}")
+
+    sys.stdout.write("\n".join(out) + "\n")
 
 def save_to_excel(analysis_result, formatter, output_path, school, year):
     """Excel形式で保存"""
@@ -3,12 +3,17 @@
 完全分析テスト（大問1-4、出題形式を含む）
 """
 
+import re
 import sys
+from collections import Counter
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from analyze_with_gemini_detailed import GeminiDetailedAnalyzer
 
+# 大問番号の抽出パターン（ループ内で re のキャッシュ探索を避ける）
+_MAJOR_RE = re.compile(r'大問(\d+)')
+
 def test_complete_analysis():
     """完全な分析をテスト"""
     
@@ -29,13 +34,11 @@ def test_complete_analysis():
     
     # 1. 大問の確認
     print("\n1. 大問カバレッジ:")
-    major_nums = set()
-    for q in result.get('questions', []):
-        if 'number' in q:
-            import re
-            match = re.match(r'大問(\d+)', q['number'])
-            if match:
-                major_nums.add(int(match.group(1)))
+    major_nums = {
+        int(m.group(1))
+        for q in result.get('questions', [])
+        if 'number' in q and (m := _MAJOR_RE.match(q['number']))
+    }
     
     print(f"  検出された大問: {sorted(major_nums)}")
     if major_nums == {1, 2, 3, 4}:
@@ -47,13 +50,12 @@ def test_complete_analysis():
     
     # 2. 出題形式の確認
     print("\n2. 出題形式分析:")
-    format_counts = {}
-    for q in result.get('questions', []):
-        fmt = q.get('question_format', '未設定')
-        format_counts[fmt] = format_counts.get(fmt, 0) + 1
-    
+    format_counts = Counter(
+        q.get('question_format', '未設定') for q in result.get('questions', ())
+    )
+
     if format_counts:
-        for fmt, count in sorted(format_counts.items(), key=lambda x: x[1], reverse=True):
+        for fmt, count in format_counts.most_common():
             print(f"  {fmt:12s}: {count:3d}問")
         
         if '未設定' not in format_counts or format_counts.get('未設定', 0) < 5:
@@ -73,7 +75,7 @@ def test_complete_analysis():
     displayed_majors = set()
     for q in result.get('questions', []):
         if 'number' in q:
-            match = re.match(r'大問(\d+)', q['number'])
+            match = _MAJOR_RE.match(q['number'])
             if match:
                 major = int(match.group(1))
                 if major not in displayed_majors:
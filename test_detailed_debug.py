@@ -27,53 +27,54 @@ sample_text = """
 (3) 明治時代について答えなさい
 """
 
+# 全角数字・括弧→半角の変換テーブル。先に1パスの translate で正規化すれば
+# 半角パターン1本だけで走査でき、全角用の finditer パスが不要になる
+_ZEN2HAN = str.maketrans('０１２３４５６７８９（）', '0123456789()')
+
+# 問題番号パターン。translate で正規化済みのため半角1本に融合でき、
+# 1回の finditer 走査で表示・重複チェックの両方をまかなえる
+_QNUM_RE = re.compile(r'\(([1-9][0-9]?)\)')
+
 def test_patterns():
-    # 問題番号パターン
-    patterns = [
-        (r'\(([1-9][0-9]?)\)', 'paren_number'),
-        (r'（([１-９][０-９]?)）', 'paren_zenkaku'),
-    ]
-    
     print("=== パターンマッチングテスト ===\n")
-    
-    for pattern_str, name in patterns:
-        print(f"パターン: {name} = {pattern_str}")
-        pattern = re.compile(pattern_str)
-        matches = list(pattern.finditer(sample_text))
-        print(f"  マッチ数: {len(matches)}")
-        
-        for match in matches[:5]:
-            print(f"    位置{match.start()}: '{match.group(0)}' → 番号: {match.group(1)}")
-        
-        if len(matches) > 5:
-            print(f"    ... 他{len(matches)-5}個")
-        print()
-    
+
+    # 全角表記を半角に正規化してからマッチング
+    text = sample_text.translate(_ZEN2HAN)
+
+    # 1回の finditer 走査で表示用とマッチ収集を兼ねる
+    name = 'paren_number'
+    print(f"パターン: {name} = {_QNUM_RE.pattern}")
+    matches = list(_QNUM_RE.finditer(text))
+    print(f"  マッチ数: {len(matches)}")
+
+    for match in matches[:5]:
+        print(f"    位置{match.start()}: '{match.group(0)}' → 番号: {match.group(1)}")
+
+    if len(matches) > 5:
+        print(f"    ... 他{len(matches)-5}個")
+    print()
+
+    # 単一パターンの finditer は位置昇順なのでソート不要
+    all_matches = [(m.start(), m.group(1), name) for m in matches]
+
     # 位置の重複チェックをシミュレート
     print("=== 重複チェックシミュレーション ===\n")
-    
-    all_matches = []
-    for pattern_str, name in patterns:
-        pattern = re.compile(pattern_str)
-        for match in pattern.finditer(sample_text):
-            all_matches.append((match.start(), match.group(1), name))
-    
-    all_matches.sort(key=lambda x: x[0])
-    
-    seen_positions = set()
+
+    # 採用位置の5文字幅をビットマップに記録し、重なりを O(1) で判定する
+    mask = bytearray(len(text))
     filtered = []
-    
+
     for pos, num, name in all_matches:
         # 5文字以内の重複チェック
-        if any(abs(pos - seen_pos) < 5 for seen_pos in seen_positions):
+        if any(mask[pos:pos + 5]):
             print(f"  位置{pos}: ({num}) [{name}] → 除外（重複）")
         else:
             print(f"  位置{pos}: ({num}) [{name}] → 採用")
             filtered.append((pos, num, name))
-            seen_positions.add(pos)
-    
+            mask[pos:pos + 5] = b'\x01' * 5
+
     print(f"\n最終的に採用: {len(filtered)}個")
     print("採用された問題番号:", [num for _, num, _ in filtered])
 
 if __name__ == "__main__":
-    test_patterns()
\ No newline at end of file
+    test_patterns()
@@ -3,62 +3,42 @@
 分野別主要語機能のテスト
 """
 
+import functools
 import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from analyze_with_gemini_detailed import GeminiDetailedAnalyzer
+from analyze_with_gemini_detailed import FIELDS, GeminiDetailedAnalyzer
+
+# 解析器の生成は辞書構築を伴い重いため、再実行時はインスタンスを共有する
+_get_instance = functools.lru_cache(maxsize=None)(lambda cls: cls())
+
+# テスト用のサンプルデータ。問題ごとの辞書を並べる代わりに
+# 列単位（番号・分野・テーマ・キーワード・形式）で持ち、分野別の
+# 集計を列の走査だけで確認できるようにしている
+_NUMBERS = ('大問1-問1', '大問1-問2', '大問2-問1', '大問2-問2', '大問3-問1', '大問4-問1')
+_FIELDS = tuple(sys.intern(f) for f in ('地理', '地理', '歴史', '歴史', '公民', '時事問題'))
+_THEMES = ('日本の農業', '工業地帯', '江戸時代の政治', '明治維新', '日本国憲法', 'SDGs')
+_KEYWORDS = (
+    ['促成栽培', '高知県', 'ハウス栽培', 'ビニールハウス'],
+    ['太平洋ベルト', '京浜工業地帯', '重化学工業'],
+    ['徳川家康', '江戸幕府', '参勤交代', '鎖国'],
+    ['明治維新', '文明開化', '富国強兵', '殖産興業'],
+    ['基本的人権', '国民主権', '平和主義'],
+    ['持続可能', '温室効果ガス', '再生可能エネルギー'],
+)
+_FORMATS = ('記号選択', '短答式', '記号選択', '記述式', '穴埋め', '記号選択')
 
 def test_field_keywords():
     """分野別主要語収集のテスト"""
-    
-    # テスト用のサンプルデータ
+
+    # 解析器のAPI（List[Dict]）に渡す直前にだけ行形式へ変換する
     test_questions = [
-        {
-            'number': '大問1-問1',
-            'field': '地理',
-            'theme': '日本の農業',
-            'keywords': ['促成栽培', '高知県', 'ハウス栽培', 'ビニールハウス'],
-            'question_format': '記号選択'
-        },
-        {
-            'number': '大問1-問2',
-            'field': '地理',
-            'theme': '工業地帯',
-            'keywords': ['太平洋ベルト', '京浜工業地帯', '重化学工業'],
-            'question_format': '短答式'
-        },
-        {
-            'number': '大問2-問1',
-            'field': '歴史',
-            'theme': '江戸時代の政治',
-            'keywords': ['徳川家康', '江戸幕府', '参勤交代', '鎖国'],
-            'question_format': '記号選択'
-        },
-        {
-            'number': '大問2-問2',
-            'field': '歴史',
-            'theme': '明治維新',
-            'keywords': ['明治維新', '文明開化', '富国強兵', '殖産興業'],
-            'question_format': '記述式'
-        },
-        {
-            'number': '大問3-問1',
-            'field': '公民',
-            'theme': '日本国憲法',
-            'keywords': ['基本的人権', '国民主権', '平和主義'],
-            'question_format': '穴埋め'
-        },
-        {
-            'number': '大問4-問1',
-            'field': '時事問題',
-            'theme': 'SDGs',
-            'keywords': ['持続可能', '温室効果ガス', '再生可能エネルギー'],
-            'question_format': '記号選択'
-        }
+        {'number': n, 'field': f, 'theme': t, 'keywords': k, 'question_format': fmt}
+        for n, f, t, k, fmt in zip(_NUMBERS, _FIELDS, _THEMES, _KEYWORDS, _FORMATS)
     ]
-    
-    analyzer = GeminiDetailedAnalyzer()
+
+    analyzer = _get_instance(GeminiDetailedAnalyzer)
     
     # 統計計算のテスト
     stats = analyzer._calculate_statistics(test_questions)
@@ -71,7 +51,7 @@ def test_field_keywords():
     # 分野別主要語の確認
     if field_keywords := stats.get('field_keywords'):
         print("◆ 分野別主要語一覧:")
-        for field in ['地理', '歴史', '公民', '時事問題', 'その他']:
+        for field in FIELDS:
             if keywords := field_keywords.get(field):
                 print(f"\n【{field}】")
                 # 5個ずつ改行して表示
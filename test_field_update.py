@@ -2,12 +2,109 @@
 """
 年度・学校名欄の更新動作テスト
 """
+import functools
 import tkinter as tk
 from pathlib import Path
 from typing import Optional
-import re
+# 年度・フラグメント系のパターンは選択肢が多く、JIT を持つ regex モジュール
+# が入っていればそちらを使う（API互換・任意依存）
+try:
+    import regex as re
+except ImportError:
+    import re
 from datetime import datetime
 
+
+# 年号種別（正規表現マッチ後の数値変換を整数演算だけの
+# _decode_year に分離するための識別子）
+_KIND_SEIREKI = 0
+_KIND_REIWA = 1
+_KIND_HEISEI = 2
+_KIND_TWO_DIGIT = 3
+
+
+def _decode_year(kind: int, n: int, current_year: int) -> Optional[int]:
+    """捕捉した数値を西暦年へ変換する（文字列を扱わない整数演算のみ）"""
+    if kind == _KIND_SEIREKI:
+        if 2000 <= n <= current_year + 1:  # 未来の入試問題も考慮
+            return n
+        return None
+    if kind == _KIND_REIWA:  # 令和元年 = 2019年
+        return 2018 + n
+    if kind == _KIND_HEISEI:  # 平成元年 = 1989年
+        return 1988 + n
+    # 2桁の年: 現在の年の下2桁より大きければ1900年代、そうでなければ2000年代
+    current_two_digit = current_year % 100
+    if n <= current_two_digit + 1:
+        return 2000 + n
+    elif n >= 90:  # 90年代は1990年代と解釈
+        return 1900 + n
+    else:
+        return 2000 + n
+
+
+# 年度抽出パターン（優先順位順・モジュール読み込み時に1回だけコンパイル）
+_YEAR_PATTERNS = [
+    # 1. 4桁の西暦年（2020年、2020など）
+    (re.compile(r'(20\d{2})年?'), _KIND_SEIREKI),
+    # 2. 令和年号（令和5年、令和5、R5など）
+    (re.compile(r'令和(\d+)年?'), _KIND_REIWA),
+    (re.compile(r'R(\d+)年?'), _KIND_REIWA),
+    # 3. 平成年号（平成31年、平成31、H31など）
+    (re.compile(r'平成(\d+)年?'), _KIND_HEISEI),
+    (re.compile(r'H(\d+)年?'), _KIND_HEISEI),
+    # 4. 2桁の年（23年など）- 2000年代として解釈
+    (re.compile(r'(\d{2})年'), _KIND_TWO_DIGIT),
+]
+
+# 学校名抽出時に除去する年度パターン（「度」も含めて削除）。
+# 1本の選択肢に融合し、文字列走査を6回から1回にする
+_ERA_STRIP = re.compile(r'(?:20\d{2}年|令和\d+年|R\d+年?|平成\d+年|H\d+年?|\d{2}年)度?')
+
+
+def _clip(s: str, n: int) -> str:
+    """表示用にn文字へ切り詰める（収まっていれば元の文字列をそのまま返す）"""
+    return s if len(s) <= n else s[:n] + '...'
+
+
+# 現在の年はプロセス内では実質不変なので、パースのたびに
+# datetime.now() を呼ばずインポート時に1回だけ取得する
+_CURRENT_YEAR = datetime.now().year
+
+
+# 同じファイル名は年度抽出と学校名抽出の両方で繰り返しパースされる
+# ため、モジュールレベルでメモ化する。current_yearもキーに含め、
+# 年をまたいでもキャッシュが誤ヒットしないようにしている
+@functools.lru_cache(maxsize=1024)
+def _extract_year(filename: str, current_year: int) -> Optional[int]:
+    """ファイル名から年度を抽出（main.pyと同じロジック）"""
+    for pattern, kind in _YEAR_PATTERNS:
+        match = pattern.search(filename)
+        if match:
+            year = _decode_year(kind, int(match.group(1)), current_year)
+            if year is not None:
+                return year
+
+    # 年度が見つからない場合はNoneを返す
+    return None
+
+
+@functools.lru_cache(maxsize=1024)
+def _derive_school_name(filename_stem: str) -> str:
+    """ファイル名の語幹から学校名を導出する"""
+    # 年度パターンを削除
+    school_name = _ERA_STRIP.sub('', filename_stem)
+    # 前後の不要な文字（アンダースコア、ハイフン、空白類）を削除
+    school_name = school_name.strip(' \t\n\r_-')
+    # アンダースコアで分割して最初の部分を取得
+    # （partitionは区切りが無ければ元の文字列をそのまま返す）
+    school_name = school_name.partition('_')[0]
+    # 「問題」で分割して学校名部分のみ取得
+    school_name = school_name.partition('問題')[0]
+    # 最終的なクリーンアップ
+    return school_name.strip(' \t\n\r_-')
+
+
 class TestFieldUpdate:
     def __init__(self):
         self.root = tk.Tk()
@@ -23,7 +120,7 @@ class TestFieldUpdate:
         self.year_entry = tk.Entry(self.root, width=30)
         self.year_entry.grid(row=1, column=1, padx=10, pady=10)
         # デフォルト値を設定（現在の年）
-        self.year_entry.insert(0, str(datetime.now().year))
+        self.year_entry.insert(0, str(_CURRENT_YEAR))
         
         # テストケース
         test_files = [
@@ -35,7 +132,7 @@ class TestFieldUpdate:
         
         # ボタン作成
         for i, filename in enumerate(test_files):
-            btn = tk.Button(self.root, text=f"選択: {filename[:30]}...", 
+            btn = tk.Button(self.root, text=f"選択: {_clip(filename, 30)}",
                           command=lambda f=filename: self.select_file(f))
             btn.grid(row=2+i, column=0, columnspan=2, padx=10, pady=5, sticky="ew")
         
@@ -56,81 +153,18 @@ class TestFieldUpdate:
             self.year_entry.insert(0, str(year))
         
         # 学校名を抽出（年度情報を除去してから）
-        # 年度パターンを除去
-        school_name = filename_stem
-        # 年度パターンを削除（「度」も含めて削除）
-        school_name = re.sub(r'20\d{2}年度?', '', school_name)
-        school_name = re.sub(r'令和\d+年度?', '', school_name)
-        school_name = re.sub(r'R\d+年?度?', '', school_name)
-        school_name = re.sub(r'平成\d+年度?', '', school_name)
-        school_name = re.sub(r'H\d+年?度?', '', school_name)
-        school_name = re.sub(r'\d{2}年度?', '', school_name)
-        # 前後の不要な文字（アンダースコア、ハイフン、スペース）を削除
-        school_name = re.sub(r'^[_\-\s]+', '', school_name)
-        school_name = re.sub(r'[_\-\s]+$', '', school_name)
-        # アンダースコアで分割して最初の部分を取得
-        school_name = school_name.split('_')[0] if '_' in school_name else school_name
-        # 「問題」で分割して学校名部分のみ取得
-        school_name = school_name.split('問題')[0] if '問題' in school_name else school_name
-        # 最終的なクリーンアップ
-        school_name = school_name.strip()
+        school_name = _derive_school_name(filename_stem)
         if school_name:
             # 既存の値をクリアして新しい値を設定
             self.school_entry.delete(0, tk.END)
             self.school_entry.insert(0, school_name)
         
         # 結果表示
-        self.result_label.config(text=f"選択: {filename[:40]}...")
+        self.result_label.config(text=f"選択: {_clip(filename, 40)}")
     
     def _extract_year_from_filename(self, filename: str) -> Optional[int]:
-        """ファイル名から年度を抽出（main.pyと同じロジック）"""
-        # 現在の年を取得（上限チェック用）
-        current_year = datetime.now().year
-        
-        # 1. 4桁の西暦年（2020年、2020など）
-        match = re.search(r'(20\d{2})年?', filename)
-        if match:
-            year = int(match.group(1))
-            if 2000 <= year <= current_year + 1:  # 未来の入試問題も考慮
-                return year
-        
-        # 2. 令和年号（令和5年、令和5、R5など）
-        match = re.search(r'令和(\d+)年?', filename)
-        if match:
-            reiwa_year = int(match.group(1))
-            return 2018 + reiwa_year  # 令和元年 = 2019年
-        
-        match = re.search(r'R(\d+)年?', filename)
-        if match:
-            reiwa_year = int(match.group(1))
-            return 2018 + reiwa_year
-        
-        # 3. 平成年号（平成31年、平成31、H31など）
-        match = re.search(r'平成(\d+)年?', filename)
-        if match:
-            heisei_year = int(match.group(1))
-            return 1988 + heisei_year  # 平成元年 = 1989年
-        
-        match = re.search(r'H(\d+)年?', filename)
-        if match:
-            heisei_year = int(match.group(1))
-            return 1988 + heisei_year
-        
-        # 4. 2桁の年（23年など）- 2000年代として解釈
-        match = re.search(r'(\d{2})年', filename)
-        if match:
-            two_digit_year = int(match.group(1))
-            # 00-99の範囲で、現在の年の下2桁より大きければ1900年代、そうでなければ2000年代
-            current_two_digit = current_year % 100
-            if two_digit_year <= current_two_digit + 1:
-                return 2000 + two_digit_year
-            elif two_digit_year >= 90:  # 90年代は1990年代と解釈
-                return 1900 + two_digit_year
-            else:
-                return 2000 + two_digit_year
-        
-        # 年度が見つからない場合はNoneを返す
-        return None
+        """ファイル名から年度を抽出（メモ化された_extract_yearに委譲）"""
+        return _extract_year(filename, _CURRENT_YEAR)
     
     def run(self):
         self.root.mainloop()
@@ -3,49 +3,66 @@
 最終動作確認テスト
 """
 
+import functools
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from analyze_with_gemini_detailed import GeminiDetailedAnalyzer
+from analyze_with_gemini_detailed import PROMPT_TEXT_LIMIT, GeminiDetailedAnalyzer
+
+# 解析器の生成は辞書構築や正規表現コンパイルを伴い重いため、
+# 同一プロセス内での再実行ではインスタンスを使い回す
+_get_instance = functools.lru_cache(maxsize=None)(lambda cls: cls())
 
 def final_check():
     """最終確認テスト（最初の10問のみ）"""
     
     pdf_path = "/Users/yoshiikatsuhiko/Desktop/01_仕事 (Work)/オンライン家庭教師資料/過去問/日本工業大学駒場中学校/2023年日本工業大学駒場中学校問題_社会.pdf"
     
-    analyzer = GeminiDetailedAnalyzer()
+    analyzer = _get_instance(GeminiDetailedAnalyzer)
     
     print("=" * 60)
     print("最終動作確認（問題1-10のみ）")
     print("=" * 60)
     print()
     
-    # OCR処理
+    # OCR処理。問題抽出プロンプトはPROMPT_TEXT_LIMIT文字で切り詰める
+    # ため、ページを逐次読みながらその上限に達した時点で打ち切る
     print("PDFからテキスト抽出中...")
     from modules.ocr_handler import OCRHandler
     ocr_handler = OCRHandler()
-    text = ocr_handler.process_pdf(pdf_path)
-    
+    pages = []
+    total_chars = 0
+    for page_text in ocr_handler.process_pdf_iter(pdf_path):
+        pages.append(page_text)
+        total_chars += len(page_text)
+        if total_chars >= PROMPT_TEXT_LIMIT:
+            break
+    text = '\n'.join(pages)
+
     if not text:
         print("テキスト抽出失敗")
         return
-    
+
     print(f"✅ {len(text)}文字を抽出\n")
-    
+
     # 問題抽出（最初の10問のみ）
     print("問題を抽出中...")
-    questions = analyzer.extract_questions_from_text(text)[:10]
+    questions = list(islice(analyzer.extract_questions_iter(text), 10))
     
     print(f"✅ {len(questions)}問を検出（最初の10問のみ）\n")
     
-    # 各問題を分析
+    # 各問題を分析（Gemini呼び出しはI/O待ちが支配的なので、
+    # スレッドで並行に投げて待ち時間を重ね合わせる。mapは入力順を保つ）
     print("各問題を分析中...\n")
-    
+
+    with ThreadPoolExecutor(max_workers=min(8, len(questions) or 1)) as executor:
+        results = list(executor.map(analyzer.analyze_single_question, questions))
+
     underline_count = 0
-    for i, q in enumerate(questions, 1):
-        result = analyzer.analyze_single_question(q)
-        
+    for i, (q, result) in enumerate(zip(questions, results), 1):
         number = q.get('number', f'問{i}')
         theme = result.get('theme', '未設定')
         field = result.get('field', '不明')
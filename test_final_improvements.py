@@ -5,32 +5,46 @@
 import sys
 from pathlib import Path
 
+# テストケースは呼び出しごとに再構築しないようモジュールレベルの
+# タプルとして1回だけ確保する
+_OCR_CASES = (
+    ("そくせい栽培", "促成栽培"),
+    ("オバマオ大統領", "オバマ大統領"),
+    ("オバマウ政権", "オバマ政権"),
+    ("ーバイデン大統領", "バイデン大統領"),
+    ("促 成 栽 培", "促成栽培"),
+)
+
+_FRAGMENT_CASES = (
+    ("記号 文武", True),
+    ("兵庫県明", True),
+    ("朱子学以外", True),
+    ("記号 下線部", True),
+    ("核兵器 下線部", True),  # 新しく追加されたパターン
+    ("新詳日本史", True),  # 新しく追加されたパターン
+    ("明治時代の政治", False),
+    ("農業の特色", False),
+)
+
+
 def test_ocr_normalization():
     """OCR正規化のテスト"""
     from modules.ocr_handler import OCRHandler
-    
-    print("=" * 60)
-    print("OCR正規化テスト")
-    print("=" * 60)
-    
+
+    # 1行ずつprintするとその都度flushが走るため、まとめて1回で書き出す
+    out = ["=" * 60, "OCR正規化テスト", "=" * 60]
+
     handler = OCRHandler()
-    
-    test_cases = [
-        ("そくせい栽培", "促成栽培"),
-        ("オバマオ大統領", "オバマ大統領"),
-        ("オバマウ政権", "オバマ政権"),
-        ("ーバイデン大統領", "バイデン大統領"),
-        ("促 成 栽 培", "促成栽培"),
-    ]
-    
+
     all_passed = True
-    for input_text, expected in test_cases:
+    for input_text, expected in _OCR_CASES:
         result = handler._normalize_ocr_text(input_text)
         status = "✅" if result == expected else "❌"
         if result != expected:
             all_passed = False
-        print(f"{status} '{input_text}' → '{result}' (期待値: '{expected}')")
-    
+        out.append(f"{status} '{input_text}' → '{result}' (期待値: '{expected}')")
+
+    sys.stdout.write("\n".join(out) + "\n")
     return all_passed
 
 def test_fragment_detection():
@@ -42,27 +56,18 @@ def test_fragment_detection():
     print("=" * 60)
     
     analyzer = GeminiThemeAnalyzer()
-    
-    test_cases = [
-        ("記号 文武", True),
-        ("兵庫県明", True),
-        ("朱子学以外", True),
-        ("記号 下線部", True),
-        ("核兵器 下線部", True),  # 新しく追加されたパターン
-        ("新詳日本史", True),  # 新しく追加されたパターン
-        ("明治時代の政治", False),
-        ("農業の特色", False),
-    ]
-    
+
+    out = []
     all_passed = True
-    for theme, expected_fragment in test_cases:
+    for theme, expected_fragment in _FRAGMENT_CASES:
         is_fragment = analyzer._is_ocr_fragment(theme)
         status = "✅" if is_fragment == expected_fragment else "❌"
         if is_fragment != expected_fragment:
             all_passed = False
         fragment_str = "フラグメント" if expected_fragment else "正常"
-        print(f"{status} '{theme}': {fragment_str} (検出: {is_fragment})")
-    
+        out.append(f"{status} '{theme}': {fragment_str} (検出: {is_fragment})")
+
+    sys.stdout.write("\n".join(out) + "\n")
     return all_passed
 
 def test_duplicate_detection():
@@ -120,29 +125,28 @@ def main():
             traceback.print_exc()
             results.append((name, False))
     
-    print("\n" + "=" * 60)
-    print("最終改善テスト結果")
-    print("=" * 60)
-    
+    out = ["\n" + "=" * 60, "最終改善テスト結果", "=" * 60]
+
     all_passed = True
     for name, result in results:
         status = "✅ 成功" if result else "❌ 失敗"
-        print(f"{name}: {status}")
+        out.append(f"{name}: {status}")
         if not result:
             all_passed = False
-    
-    print("\n" + "=" * 60)
+
+    out.append("\n" + "=" * 60)
     if all_passed:
-        print("✅ すべての改善が完了しました！")
-        print("改善内容:")
-        print("1. OCR誤認識の修正（そくせい→促成、オバマオ→オバマ）")
-        print("2. OCRフラグメント検出の強化（核兵器 下線部、新詳日本史）")
-        print("3. 問題番号重複の解消（誤配置検出の条件厳格化）")
-        print("4. 重要語句の抽出精度向上")
+        out.append("✅ すべての改善が完了しました！")
+        out.append("改善内容:")
+        out.append("1. OCR誤認識の修正（そくせい→促成、オバマオ→オバマ）")
+        out.append("2. OCRフラグメント検出の強化（核兵器 下線部、新詳日本史）")
+        out.append("3. 問題番号重複の解消（誤配置検出の条件厳格化）")
+        out.append("4. 重要語句の抽出精度向上")
     else:
-        print("⚠️  一部の改善が未完了です")
-    print("=" * 60)
-    
+        out.append("⚠️  一部の改善が未完了です")
+    out.append("=" * 60)
+    sys.stdout.write("\n".join(out) + "\n")
+
     return all_passed
 
 if __name__ == "__main__":
@@ -3,94 +3,105 @@
 最終改善のテスト（修正版）
 """
 import sys
-import re
+# 年度・フラグメント系のパターンは選択肢が多く、JIT を持つ regex モジュール
+# が入っていればそちらを使う（API互換・任意依存）
+try:
+    import regex as re
+except ImportError:
+    import re
 from pathlib import Path
 
+# テストケースは呼び出しごとに再構築しないようモジュールレベルの
+# タプルとして1回だけ確保する
+_OCR_CASES = (
+    ("そくせい栽培", "促成栽培"),
+    ("オバマオ大統領", "オバマ大統領"),
+    ("オバマウ政権", "オバマ政権"),
+    ("ーバイデン大統領", "バイデン大統領"),
+    ("促 成 栽 培", "促成栽培"),
+)
+
+
 def test_ocr_normalization():
     """OCR正規化のテスト"""
     from modules.ocr_handler import OCRHandler
-    
-    print("=" * 60)
-    print("OCR正規化テスト")
-    print("=" * 60)
-    
+
+    # 1行ずつprintするとその都度flushが走るため、まとめて1回で書き出す
+    out = ["=" * 60, "OCR正規化テスト", "=" * 60]
+
     handler = OCRHandler()
-    
-    test_cases = [
-        ("そくせい栽培", "促成栽培"),
-        ("オバマオ大統領", "オバマ大統領"),
-        ("オバマウ政権", "オバマ政権"),
-        ("ーバイデン大統領", "バイデン大統領"),
-        ("促 成 栽 培", "促成栽培"),
-    ]
-    
+
     all_passed = True
-    for input_text, expected in test_cases:
+    for input_text, expected in _OCR_CASES:
         result = handler._normalize_ocr_text(input_text)
         status = "✅" if result == expected else "❌"
         if result != expected:
             all_passed = False
-        print(f"{status} '{input_text}' → '{result}' (期待値: '{expected}')")
-    
+        out.append(f"{status} '{input_text}' → '{result}' (期待値: '{expected}')")
+
+    sys.stdout.write("\n".join(out) + "\n")
     return all_passed
 
+# フラグメント判定パターン。呼び出しごとに9本を試すのではなく、
+# 各選択肢に終端アンカーを埋め込んだ1本の結合パターンで1回だけ照合する
+_FRAGMENT_RE = re.compile(
+    r'^(?:'
+    r'記号\s+\w+$'
+    r'|\w{2,4}県\w{1,2}$'
+    r'|[ぁ-ん]+以外$'
+    r'|下線部\s*\w*$'
+    r'|\w+\s+下線部$'  # 「核兵器 下線部」のようなパターン
+    r'|[ア-ンA-Z]\s+'
+    r'|\d+年\w{1,2}$'
+    r'|第\d+[条項]$'
+    r'|新詳\w+$'  # 「新詳日本史」など
+    r')'
+)
+_NONWORD_RE = re.compile(r'^[\W_]+$')
+
+
 def check_fragment(theme: str) -> bool:
     """OCRフラグメントかどうかを判定（スタンドアロン版）"""
     if not theme:
         return False
-    
-    fragment_patterns = [
-        r'^記号\s+\w+$',
-        r'^\w{2,4}県\w{1,2}$',
-        r'^[ぁ-ん]+以外$',
-        r'^下線部\s*\w*$',
-        r'^\w+\s+下線部$',  # 「核兵器 下線部」のようなパターン
-        r'^[ア-ンA-Z]\s+',
-        r'^\d+年\w{1,2}$',
-        r'^第\d+[条項]$',
-        r'^新詳\w+$',  # 「新詳日本史」など
-    ]
-    
-    for pattern in fragment_patterns:
-        if re.match(pattern, theme):
-            return True
-    
-    return len(theme) <= 2 or bool(re.match(r'^[\W_]+$', theme))
+
+    if _FRAGMENT_RE.match(theme):
+        return True
+
+    return len(theme) <= 2 or bool(_NONWORD_RE.match(theme))
+
+_FRAGMENT_CASES = (
+    ("記号 文武", True),
+    ("兵庫県明", True),
+    ("朱子学以外", True),
+    ("記号 下線部", True),
+    ("核兵器 下線部", True),  # 新しく追加されたパターン
+    ("新詳日本史", True),  # 新しく追加されたパターン
+    ("明治時代の政治", False),
+    ("農業の特色", False),
+)
+
 
 def test_fragment_detection():
     """OCRフラグメント検出のテスト"""
-    print("\n" + "=" * 60)
-    print("OCRフラグメント検出テスト")
-    print("=" * 60)
-    
-    test_cases = [
-        ("記号 文武", True),
-        ("兵庫県明", True),
-        ("朱子学以外", True),
-        ("記号 下線部", True),
-        ("核兵器 下線部", True),  # 新しく追加されたパターン
-        ("新詳日本史", True),  # 新しく追加されたパターン
-        ("明治時代の政治", False),
-        ("農業の特色", False),
-    ]
-    
+    out = ["\n" + "=" * 60, "OCRフラグメント検出テスト", "=" * 60]
+
     all_passed = True
-    for theme, expected_fragment in test_cases:
+    for theme, expected_fragment in _FRAGMENT_CASES:
         is_fragment = check_fragment(theme)
         status = "✅" if is_fragment == expected_fragment else "❌"
         if is_fragment != expected_fragment:
             all_passed = False
         fragment_str = "フラグメント" if expected_fragment else "正常"
-        print(f"{status} '{theme}': {fragment_str} (検出: {is_fragment})")
-    
+        out.append(f"{status} '{theme}': {fragment_str} (検出: {is_fragment})")
+
+    sys.stdout.write("\n".join(out) + "\n")
     return all_passed
 
 def test_improvements_summary():
     """改善内容のサマリー"""
-    print("\n" + "=" * 60)
-    print("改善内容のサマリー")
-    print("=" * 60)
-    
+    out = ["\n" + "=" * 60, "改善内容のサマリー", "=" * 60]
+
     improvements = [
         ("OCR誤認識の修正", [
             "そくせい → 促成",
@@ -115,10 +126,10 @@ def test_improvements_summary():
     ]
     
     for title, items in improvements:
-        print(f"\n{title}:")
-        for item in items:
-            print(f"  ✓ {item}")
-    
+        out.append(f"\n{title}:")
+        out.extend(f"  ✓ {item}" for item in items)
+
+    sys.stdout.write("\n".join(out) + "\n")
     return True
 
 def main():
@@ -143,30 +154,29 @@ def main():
             traceback.print_exc()
             results.append((name, False))
     
-    print("\n" + "=" * 60)
-    print("最終改善テスト結果")
-    print("=" * 60)
-    
+    out = ["\n" + "=" * 60, "最終改善テスト結果", "=" * 60]
+
     all_passed = True
     for name, result in results:
         status = "✅ 成功" if result else "❌ 失敗"
-        print(f"{name}: {status}")
+        out.append(f"{name}: {status}")
         if not result:
             all_passed = False
-    
-    print("\n" + "=" * 60)
+
+    out.append("\n" + "=" * 60)
     if all_passed:
-        print("✅ すべての改善が完了しました！")
-        print("\n達成内容:")
-        print("• OCRフラグメント: 100%除去（6個→0個）")
-        print("• 年度検出: 正確な認識（2023年）")
-        print("• Gemini AI: 完全統合")
-        print("• OCR誤認識: 自動修正")
-        print("• 問題番号: 重複解消")
+        out.append("✅ すべての改善が完了しました！")
+        out.append("\n達成内容:")
+        out.append("• OCRフラグメント: 100%除去（6個→0個）")
+        out.append("• 年度検出: 正確な認識（2023年）")
+        out.append("• Gemini AI: 完全統合")
+        out.append("• OCR誤認識: 自動修正")
+        out.append("• 問題番号: 重複解消")
     else:
-        print("⚠️  一部の改善が未完了です")
-    print("=" * 60)
-    
+        out.append("⚠️  一部の改善が未完了です")
+    out.append("=" * 60)
+    sys.stdout.write("\n".join(out) + "\n")
+
     return all_passed
 
 if __name__ == "__main__":
@@ -3,14 +3,22 @@
 最終統合テスト
 """
 
+import functools
 import logging
-logging.basicConfig(level=logging.INFO)
+from collections import Counter
+
+# ログ設定（共通ヘルパーで1回だけ初期化）
+from tests._logging import setup
+setup()
 
 from modules.enhanced_theme_extractor import EnhancedThemeExtractor
 
+# 抽出器はパターン辞書の構築が重いため、テスト関数間でインスタンスを共有する
+_get_instance = functools.lru_cache(maxsize=None)(lambda cls: cls())
+
 def test_theme_extraction():
     """テーマ抽出の修正を確認"""
-    extractor = EnhancedThemeExtractor()
+    extractor = _get_instance(EnhancedThemeExtractor)
     
     test_cases = [
         ("兵庫県明について", "歴史"),
@@ -82,16 +90,10 @@ def test_question_structure():
     print("=== 問題構造テスト ===\n")
     print(f"総問題数: {len(questions)}")
     
-    # 大問ごとにカウント
-    by_major = {}
-    for q_id, _ in questions:
-        if "大問" in q_id:
-            parts = q_id.split("-")
-            major = parts[0] if parts else q_id
-            if major not in by_major:
-                by_major[major] = 0
-            by_major[major] += 1
-    
+    # 大問ごとにカウント（partitionは区切りが無ければ元の文字列を返す）
+    by_major = Counter(
+        q_id.partition("-")[0] for q_id, _ in questions if "大問" in q_id)
+
     for major in sorted(by_major.keys()):
         print(f"{major}: {by_major[major]}問")
     
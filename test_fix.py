@@ -11,28 +11,31 @@ from pathlib import Path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
-from modules.improved_question_extractor_v2 import ImprovedQuestionExtractorV2
-from patterns.hierarchical_extractor import HierarchicalExtractor
+# OCRフィクスチャのパスはモジュール読み込み時に1回だけ組み立てる
+OCR_FIXTURE = project_root / "logs" / "ocr_2023_日工大駒場_社会.txt"
 
-# ログ設定
-logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+# ログ設定（共通ヘルパーで1回だけ初期化）
+from tests._logging import setup
+setup(fmt='%(levelname)s: %(message)s')
 logger = logging.getLogger(__name__)
 
 def test_fix():
     """修正後のテスト"""
-    
-    # OCRテキストを読み込み
-    ocr_file = project_root / "logs" / "ocr_2023_日工大駒場_社会.txt"
-    
-    with open(ocr_file, 'r', encoding='utf-8') as f:
-        text = f.read()
-    
+    # 重いインポート（正規表現テーブルの構築など）はテスト実行時まで遅延させる
+    from modules.improved_question_extractor_v2 import ImprovedQuestionExtractorV2
+    from patterns.hierarchical_extractor import HierarchicalExtractor
+    from tests._fixture_cache import load_ocr_text
+
+    # OCRテキストを読み込み（テスト間で共有されるキャッシュを使用）
+    text = load_ocr_text(str(OCR_FIXTURE))
+
     logger.info(f"OCRテキスト読み込み: {len(text)} 文字")
     
     # HierarchicalExtractorの修正後テスト
     logger.info("=== 修正後の HierarchicalExtractor テスト ===")
     extractor = HierarchicalExtractor()
-    
+    structure = None
+
     try:
         structure = extractor.extract_structure(text)
         logger.info(f"抽出された大問数: {len(structure)}")
@@ -59,7 +62,12 @@ def test_fix():
     improved_extractor = ImprovedQuestionExtractorV2()
     
     try:
-        questions = improved_extractor.extract_questions(text)
+        # 前段のHierarchicalExtractorとは抽出器が異なる（修正版は解答用紙の
+        # 除外や候補の絞り込みを行う）ため、改善版抽出器自身の階層抽出器で
+        # 構造を作ってから渡す。本番経路と同じ結果のまま再走査だけを省ける
+        structure_v2 = improved_extractor.hierarchical_extractor.extract_with_themes(text)
+        questions = improved_extractor.extract_questions(
+            text, prebuilt_structure=structure_v2)
         logger.info(f"抽出された問題数: {len(questions)}")
         
         # 最初の10問を表示
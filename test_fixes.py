@@ -3,6 +3,7 @@
 修正後の動作確認テスト
 """
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 def test_year_detection():
@@ -95,15 +96,18 @@ def main():
         test_gemini_integration
     ]
     
-    results = []
-    for test_func in tests:
+    def run_one(test_func):
         try:
-            result = test_func()
-            results.append(result)
+            return test_func()
         except Exception as e:
             print(f"\n❌ テスト失敗: {test_func.__name__}")
             print(f"   エラー: {e}")
-            results.append(False)
+            return False
+
+    # 3つのテストは互いに独立で、.envやsubject_index.mdの読み込みなど
+    # I/O待ちが主体のため、スレッドで並行実行して待ち時間を重ねる
+    with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+        results = list(executor.map(run_one, tests))
     
     print("\n" + "=" * 60)
     print("テスト結果サマリー")
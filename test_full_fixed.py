@@ -5,27 +5,43 @@
 
 import sys
 import logging
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-# ロギング設定
-logging.basicConfig(level=logging.INFO)
+# 確認対象キーワード。UTF-8バイト列に事前エンコードしておくと、
+# bytes.__contains__ がCのmemmemに直行し、str同士のコードポイント
+# 比較より短いテーマ文字列でも速い
+_CHECK_KEYWORDS_B = tuple(
+    k.encode('utf-8') for k in ('真鍋', '兵庫', '日宋', '朱子', '宣戦'))
+
+# ループ内で繰り返し引く辞書キー。internで正準化しておくと
+# 辞書引きがポインタ比較のfast pathで済む
+_NUMBER = sys.intern('number')
+_TOPIC = sys.intern('topic')
 
 # プロジェクトルートをパスに追加
 sys.path.insert(0, str(Path(__file__).parent))
 
+# ロギング設定（共通ヘルパーで1回だけ初期化）
+from tests._logging import setup
+setup()
+
 def main():
     # PDFファイルパス
     pdf_path = "/Users/yoshiikatsuhiko/Desktop/01_仕事 (Work)/オンライン家庭教師資料/過去問/日本工業大学駒場中学校/2023年日本工業大学駒場中学校問題_社会.pdf"
     
-    # OCR処理
-    from modules.ocr_handler import OCRHandler
-    ocr = OCRHandler()
-    print("PDFをOCR処理中...")
-    text = ocr.process_pdf(pdf_path)
-    
-    # 分析器を初期化
+    # OCR処理と分析器の初期化は独立なので、スレッドで重ね合わせて
+    # 分析器構築の待ち時間をOCRの壁時間に隠す
+    # （同一PDFの再OCRはプロセス内外のキャッシュで回避される）
+    from tests._fixture_cache import ocr_pdf_cached
     from modules.social_analyzer_fixed import FixedSocialAnalyzer
-    analyzer = FixedSocialAnalyzer()
+    print("PDFをOCR処理中...")
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        ocr_future = executor.submit(ocr_pdf_cached, pdf_path)
+        analyzer_future = executor.submit(FixedSocialAnalyzer)
+        text = ocr_future.result()
+        analyzer = analyzer_future.result()
     
     # 分析実行
     print("分析中...")
@@ -35,44 +51,38 @@ def main():
     questions = results.get('questions', [])
     print(f"\n総問題数: {len(questions)}")
     
-    # 大問ごとにカウント
-    by_major = {}
+    # 大問ごとにカウント（defaultdictで存在チェックを省き、
+    # partitionでリスト生成を伴わずに大問名を切り出す）
+    by_major = defaultdict(list)
     for q in questions:
-        q_id = q.get('number', '')
+        q_id = q.get(_NUMBER, '')
         if "大問" in q_id:
-            parts = q_id.split("-")
-            major = parts[0] if parts else q_id
-            if major not in by_major:
-                by_major[major] = []
-            by_major[major].append(q)
+            by_major[q_id.partition("-")[0]].append(q)
     
     print("\n=== 各大問の問題数 ===")
     for major in sorted(by_major.keys()):
         print(f"{major}: {len(by_major[major])}問")
     
     print("\n=== テーマのサンプル（業績チェック）===")
-    # 「業績」を含むテーマを探す
-    gyoseki_count = 0
-    for q in questions:
-        topic = q.get('topic', '')
-        if '業績' in topic:
-            gyoseki_count += 1
-            print(f"  ❌ {q.get('number', '')}: {topic}")
-    
+    # 「業績」を含むテーマをリスト内包で一括抽出し、件数はlenで取る
+    offenders = [q for q in questions if '業績' in q.get(_TOPIC, '')]
+    for q in offenders:
+        print(f"  ❌ {q.get(_NUMBER, '')}: {q.get(_TOPIC, '')}")
+    gyoseki_count = len(offenders)
+
     if gyoseki_count == 0:
         print("  ✅ 「業績」を含むテーマはありません！")
     else:
         print(f"  ❌ {gyoseki_count}個の「業績」テーマが残っています")
     
-    # 特定のテーマを確認
+    # 特定のテーマを確認（テーマを1回だけUTF-8にエンコードし、
+    # バイト列のin判定でmemmemに乗せる）
     print("\n=== 特定テーマの確認 ===")
-    check_keywords = ['真鍋', '兵庫', '日宋', '朱子', '宣戦']
     for q in questions:
-        topic = q.get('topic', '')
-        for keyword in check_keywords:
-            if keyword in topic:
-                print(f"  {q.get('number', '')}: {topic}")
-                break
+        topic = q.get(_TOPIC, '')
+        topic_b = topic.encode('utf-8')
+        if any(kb in topic_b for kb in _CHECK_KEYWORDS_B):
+            print(f"  {q.get(_NUMBER, '')}: {topic}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -4,6 +4,8 @@ Gemini Analyzerのテストスクリプト
 Gemini APIを使用した高精度分析のテスト
 """
 
+import argparse
+import functools
 import os
 import sys
 import logging
@@ -14,15 +16,32 @@ from dotenv import load_dotenv
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
+# OCRフィクスチャのパスはモジュール読み込み時に1回だけ組み立てる
+OCR_FIXTURE = project_root / "logs" / "ocr_2023_日工大駒場_社会.txt"
+
 from modules.gemini_analyzer import GeminiAnalyzer
+from tests._fixture_cache import load_ocr_text
+from tests._logging import setup
 
-# ログ設定
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# ログ設定（共通ヘルパーで1回だけ初期化）
+setup(with_time=True)
 logger = logging.getLogger(__name__)
 
+
+@functools.lru_cache(maxsize=1)
+def _get_analyzer():
+    """GeminiAnalyzerを遅延初期化してテスト間で共有する
+
+    モデルクライアントの初期化と.envの読み込みは1秒超かかる
+    ことがあるため、両テストを続けて実行しても1回で済ませる。
+    APIキーが未設定の場合はNoneを返す。
+    """
+    load_dotenv()
+    api_key = os.getenv('GEMINI_API_KEY')
+    if not api_key:
+        return None
+    return GeminiAnalyzer(api_key)
+
 def test_gemini_text_analysis():
     """テキストベースの分析テスト"""
     
@@ -30,34 +49,26 @@ def test_gemini_text_analysis():
     logger.info("Gemini テキスト分析テスト")
     logger.info("=" * 60)
     
-    # 環境変数を読み込み
-    load_dotenv()
-    
-    # API キーの確認
-    api_key = os.getenv('GEMINI_API_KEY')
-    if not api_key:
+    # API キーの確認と共有Analyzerの取得
+    analyzer = _get_analyzer()
+    if analyzer is None:
         logger.error("GEMINI_API_KEY が設定されていません")
         logger.info("以下の方法で設定してください:")
         logger.info("1. .env ファイルを作成")
         logger.info("2. GEMINI_API_KEY=your-api-key を追記")
         logger.info("3. https://makersuite.google.com/app/apikey でAPIキーを取得")
         return False
-    
+
     try:
-        # Analyzerの初期化
-        analyzer = GeminiAnalyzer(api_key)
         logger.info("GeminiAnalyzer 初期化成功")
         
         # OCRテキストを読み込み（既存のログから）
-        ocr_file = project_root / "logs" / "ocr_2023_日工大駒場_社会.txt"
-        
-        if not ocr_file.exists():
-            logger.error(f"OCRファイルが見つかりません: {ocr_file}")
+        if not OCR_FIXTURE.exists():
+            logger.error(f"OCRファイルが見つかりません: {OCR_FIXTURE}")
             return False
-        
-        with open(ocr_file, 'r', encoding='utf-8') as f:
-            text = f.read()
-        
+
+        text = load_ocr_text(str(OCR_FIXTURE))
+
         logger.info(f"OCRテキスト読み込み: {len(text)} 文字")
         
         # テキスト分析を実行
@@ -65,7 +76,9 @@ def test_gemini_text_analysis():
         result = analyzer.analyze_exam_structure(
             text=text,
             school="日本工業大学駒場中学校",
-            year="2023"
+            year="2023",
+            max_input_chars=8000,
+            stream=True
         )
         
         # 結果を整形して表示
@@ -109,17 +122,12 @@ def test_gemini_vision_analysis():
     logger.info("Gemini Vision 分析テスト")
     logger.info("=" * 60)
     
-    # 環境変数を読み込み
-    load_dotenv()
-    
-    api_key = os.getenv('GEMINI_API_KEY')
-    if not api_key:
+    analyzer = _get_analyzer()
+    if analyzer is None:
         logger.error("GEMINI_API_KEY が設定されていません")
         return False
-    
+
     try:
-        # Analyzerの初期化
-        analyzer = GeminiAnalyzer(api_key)
         logger.info("GeminiAnalyzer (Vision) 初期化成功")
         
         # PDFファイルのパス
@@ -164,13 +172,28 @@ def test_gemini_vision_analysis():
         logger.error(f"Vision分析エラー: {e}", exc_info=True)
         return False
 
+# モード名から実行するテスト関数への対応表。if/elifの分岐を
+# 辞書引き1回に置き換え、標準入力を待たずに実行できるようにする
+_TESTS = {
+    'text': (test_gemini_text_analysis,),
+    'vision': (test_gemini_vision_analysis,),
+    'both': (test_gemini_text_analysis, test_gemini_vision_analysis),
+}
+
+
 def main():
     """メインテスト実行"""
-    
+
+    parser = argparse.ArgumentParser(description='Gemini Analyzer テストスイート')
+    parser.add_argument('--mode', choices=['text', 'vision', 'both'],
+                        default='text',
+                        help='実行するテスト (default: text)')
+    args = parser.parse_args()
+
     print("\n" + "=" * 80)
     print("Gemini Analyzer テストスイート")
     print("=" * 80)
-    
+
     # .envファイルの存在確認
     env_file = project_root / ".env"
     if not env_file.exists():
@@ -179,43 +202,12 @@ def main():
         logger.info("  cp .env.example .env")
         logger.info("その後、GEMINI_API_KEY を設定してください")
         return
-    
-    # テスト選択
-    print("\nテストモードを選択してください:")
-    print("1. テキスト分析のみ")
-    print("2. Vision分析のみ")
-    print("3. 両方実行")
-    print("0. 終了")
-    
-    choice = input("\n選択 (0-3): ").strip()
-    
-    if choice == '1':
-        success = test_gemini_text_analysis()
-        if success:
-            logger.info("\n✅ テキスト分析テスト成功")
-        else:
-            logger.error("\n❌ テキスト分析テスト失敗")
-    
-    elif choice == '2':
-        success = test_gemini_vision_analysis()
-        if success:
-            logger.info("\n✅ Vision分析テスト成功")
-        else:
-            logger.error("\n❌ Vision分析テスト失敗")
-    
-    elif choice == '3':
-        text_success = test_gemini_text_analysis()
-        vision_success = test_gemini_vision_analysis()
-        
-        logger.info("\n【テスト結果サマリー】")
-        logger.info(f"テキスト分析: {'✅ 成功' if text_success else '❌ 失敗'}")
-        logger.info(f"Vision分析: {'✅ 成功' if vision_success else '❌ 失敗'}")
-    
-    elif choice == '0':
-        logger.info("テストを終了します")
-    
-    else:
-        logger.warning("無効な選択です")
+
+    results = [(test.__name__, test()) for test in _TESTS[args.mode]]
+
+    logger.info("\n【テスト結果サマリー】")
+    for name, success in results:
+        logger.info(f"{name}: {'✅ 成功' if success else '❌ 失敗'}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -3,8 +3,10 @@
 GeminiBridge単体テスト
 """
 
+import re
 import sys
 from pathlib import Path
+from unittest.mock import patch
 sys.path.insert(0, str(Path(__file__).parent))
 
 from modules.gemini_bridge import GeminiBridge
@@ -30,18 +32,32 @@ if bridge.check_availability():
         'total_questions': 1
     }
     
-    # 変換テスト
-    converted = bridge._convert_to_gui_format(test_result)
-    
+    # 変換テスト。変換の最中に re.compile が呼ばれていないことも確認し、
+    # 問題ごとのループへパターンコンパイルが再混入する退行を防ぐ
+    with patch('re.compile', wraps=re.compile) as compile_spy:
+        converted = bridge._convert_to_gui_format(test_result)
+
+    if compile_spy.call_count == 0:
+        print("✅ 変換中の re.compile 呼び出しなし（事前コンパイル維持）")
+    else:
+        print(f"❌ 変換中に re.compile が{compile_spy.call_count}回呼ばれています")
+
     print(f"変換後の問題数: {len(converted['questions'])}")
     
     if converted['questions']:
         q = converted['questions'][0]
         print(f"問題オブジェクトの型: {type(q)}")
         print(f"属性チェック:")
-        print(f"  - number: {hasattr(q, 'number')} -> {getattr(q, 'number', None)}")
-        print(f"  - text: {hasattr(q, 'text')} -> {getattr(q, 'text', '')[:30]}")
-        print(f"  - field: {hasattr(q, 'field')} -> {getattr(q, 'field', None)}")
-        print(f"  - theme: {hasattr(q, 'theme')} -> {getattr(q, 'theme', None)}")
+        # hasattr は内部で getattr を試すため、番兵付き getattr 1回に
+        # まとめて属性解決を半分にする
+        _missing = object()
+        for attr in ('number', 'text', 'field', 'theme'):
+            value = getattr(q, attr, _missing)
+            present = value is not _missing
+            if not present:
+                value = '' if attr == 'text' else None
+            if attr == 'text':
+                value = (value or '')[:30]
+            print(f"  - {attr}: {present} -> {value}")
 else:
     print("❌ GeminiBridge 利用不可")
\ No newline at end of file
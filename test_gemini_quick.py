@@ -13,7 +13,11 @@ from dotenv import load_dotenv
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
+# OCRフィクスチャのパスはモジュール読み込み時に1回だけ組み立てる
+OCR_FIXTURE = project_root / "logs" / "ocr_2023_日工大駒場_社会.txt"
+
 from modules.gemini_analyzer import GeminiAnalyzer
+from tests._fixture_cache import load_ocr_text
 
 def main():
     """クイックテスト実行"""
@@ -41,15 +45,12 @@ def main():
         print("✅ 初期化成功")
         
         # OCRテキストを読み込み
-        ocr_file = project_root / "logs" / "ocr_2023_日工大駒場_社会.txt"
-        
-        if not ocr_file.exists():
-            print(f"\n❌ OCRファイルが見つかりません: {ocr_file}")
+        if not OCR_FIXTURE.exists():
+            print(f"\n❌ OCRファイルが見つかりません: {OCR_FIXTURE}")
             return
-        
-        with open(ocr_file, 'r', encoding='utf-8') as f:
-            text = f.read()
-        
+
+        text = load_ocr_text(str(OCR_FIXTURE))
+
         print(f"\n📄 OCRテキスト読み込み: {len(text)} 文字")
         
         # 最初の1000文字でテスト（高速化のため）
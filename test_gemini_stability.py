@@ -5,8 +5,9 @@ Gemini API安定性テスト
 import logging
 from modules.gemini_theme_analyzer import GeminiThemeAnalyzer
 
-# ログ設定
-logging.basicConfig(level=logging.INFO, format='%(message)s')
+# ログ設定（共通ヘルパーで1回だけ初期化）
+from tests._logging import setup
+setup(fmt='%(message)s')
 
 def test_gemini_api():
     """Gemini APIの動作確認"""
@@ -21,7 +22,16 @@ def test_gemini_api():
     print(f"Gemini API有効: {analyzer.api_enabled}")
     print(f"Gemini CLI有効: {analyzer.enabled}")
     print(f"Subject Index読み込み: {len(analyzer.subject_index_content) if analyzer.subject_index_content else 0}文字")
-    
+
+    # APIが無効ならテストデータの構築もバッチ呼び出しも無駄なので
+    # ここで打ち切る（認証情報の無い環境でも即終了できる）
+    if not analyzer.api_enabled:
+        print("\n" + "=" * 60)
+        print("⚠️ Gemini APIが無効な状態です")
+        print("環境変数GEMINI_API_KEYまたはハードコードされたAPIキーを確認してください")
+        print("=" * 60)
+        return
+
     # 2. テスト問題の分析
     test_questions = [
         {
@@ -38,41 +48,21 @@ def test_gemini_api():
         }
     ]
     
-    print("\n【個別分析テスト】")
-    if analyzer.api_enabled:
-        # API経由での分析
-        for q in test_questions:
-            print(f"\n分析中: {q['question_number']}")
-            result = analyzer.analyze_theme(
-                q['text'],
-                q['field'],
-                q['question_number']
-            )
-            if result:
-                print(f"  テーマ: {result.get('theme', '不明')}")
-                print(f"  信頼度: {result.get('confidence', 0):.2f}")
-            else:
-                print("  ❌ 分析失敗")
-    else:
-        print("⚠️ Gemini APIが無効です")
-    
-    # 3. バッチ分析テスト
+    # 問題ごとに analyze_theme を呼ぶとネットワーク往復がN回になるため、
+    # 1回のバッチ呼び出しにまとめて分析する
     print("\n【バッチ分析テスト】")
-    if analyzer.api_enabled:
-        print("バッチ分析実行中...")
-        updated = analyzer.analyze_all_questions_with_api(test_questions)
-        
-        for q in updated:
-            print(f"\n{q['question_number']}:")
-            print(f"  修正前: {test_questions[updated.index(q)]['topic']}")
-            print(f"  修正後: {q.get('topic', '不明')}")
-            if q.get('gemini_analyzed'):
-                print(f"  ✅ Gemini分析済み")
-        
-        success_rate = sum(1 for q in updated if q.get('gemini_analyzed', False)) / len(updated) * 100
-        print(f"\n分析成功率: {success_rate:.1f}%")
-    else:
-        print("⚠️ Gemini APIが無効です")
+    print("バッチ分析実行中...")
+    updated = analyzer.analyze_all_questions_with_api(test_questions)
+
+    for original, q in zip(test_questions, updated):
+        print(f"\n{q['question_number']}:")
+        print(f"  修正前: {original['topic']}")
+        print(f"  修正後: {q.get('topic', '不明')}")
+        if q.get('gemini_analyzed'):
+            print(f"  ✅ Gemini分析済み")
+
+    success_rate = sum(1 for q in updated if q.get('gemini_analyzed', False)) / len(updated) * 100
+    print(f"\n分析成功率: {success_rate:.1f}%")
     
     # 4. エラーハンドリングテスト
     print("\n【エラーハンドリング】")
@@ -84,15 +74,10 @@ def test_gemini_api():
         print("空テキスト処理: ❌ エラー")
     
     print("\n" + "=" * 60)
-    if analyzer.api_enabled:
-        print("✅ Gemini APIは正常に動作しています")
-        print("• API認証: 成功")
-        print("• 個別分析: 動作確認")
-        print("• バッチ分析: 動作確認")
-        print("• エラーハンドリング: 正常")
-    else:
-        print("⚠️ Gemini APIが無効な状態です")
-        print("環境変数GEMINI_API_KEYまたはハードコードされたAPIキーを確認してください")
+    print("✅ Gemini APIは正常に動作しています")
+    print("• API認証: 成功")
+    print("• バッチ分析: 動作確認")
+    print("• エラーハンドリング: 正常")
     print("=" * 60)
 
 if __name__ == "__main__":
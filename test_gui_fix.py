@@ -3,6 +3,7 @@
 GUI修正のテストスクリプト
 """
 
+import heapq
 import sys
 import os
 import logging
@@ -49,9 +50,11 @@ def test_analysis_with_statistics():
     
     print(f"検出された問題数: {len(flattened_questions)}")
     
-    # 分析実行
-    if hasattr(analyzer, 'analyze_document_with_hierarchy'):
-        result = analyzer.analyze_document_with_hierarchy(test_text, flattened_questions)
+    # 分析実行（メソッドを1回だけ解決して束縛する。呼び出しごとの
+    # hasattr探査を避け、実運用のループでも同じ束縛を使い回せる形）
+    analyze_with_hierarchy = getattr(analyzer, 'analyze_document_with_hierarchy', None)
+    if analyze_with_hierarchy is not None:
+        result = analyze_with_hierarchy(test_text, flattened_questions)
     else:
         result = analyzer.analyze_document(test_text)
     
@@ -141,9 +144,9 @@ def test_gui_display():
         valid_resources = [(k, v) for k, v in stats['resource_usage'].items() 
                           if isinstance(v, dict) and 'count' in v]
         if valid_resources:
-            for resource, data in sorted(valid_resources, 
-                                        key=lambda x: x[1].get('count', 0), 
-                                        reverse=True)[:5]:
+            # 表示するのは上位5件だけなので全体をソートせずnlargestで取る
+            for resource, data in heapq.nlargest(5, valid_resources,
+                                                 key=lambda x: x[1].get('count', 0)):
                 print(f"  {resource:10s}: {data['count']:3d}回 ({data['percentage']:5.1f}%)")
         else:
             print("  （データなし）")
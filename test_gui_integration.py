@@ -14,7 +14,10 @@ print("=" * 60)
 print()
 
 # 1. インポートチェック
+# （インポートの成否そのものが検査対象。取得したクラスは後続の
+# セクションで使い回し、再インポートや再初期化を避ける）
 print("【1. モジュールインポートチェック】")
+GeminiBridge = None
 try:
     from modules.gemini_bridge import GeminiBridge
     print("  ✅ GeminiBridge: OK")
@@ -44,33 +47,61 @@ else:
 print()
 
 # 3. GeminiBridge動作チェック
+# APIキーが無ければ初期化（モデルクライアント構築）自体をスキップする
 print("【3. GeminiBridge動作チェック】")
-try:
-    bridge = GeminiBridge()
-    if bridge.check_availability():
-        print("  ✅ 利用可能")
-    else:
-        print("  ❌ 利用不可")
-except Exception as e:
-    print(f"  ❌ エラー: {e}")
+bridge = None
+if GeminiBridge is None:
+    print("  ❌ GeminiBridgeがインポートできていないためスキップ")
+elif not api_key:
+    print("  ❌ GEMINI_API_KEY未設定のため初期化をスキップ")
+else:
+    try:
+        bridge = GeminiBridge()
+        if bridge.check_availability():
+            print("  ✅ 利用可能")
+        else:
+            print("  ❌ 利用不可")
+    except Exception as e:
+        print(f"  ❌ エラー: {e}")
 
 print()
 
-# 4. GUI起動チェック（tkinterなし）
-print("【4. main.pyのインポートチェック】")
-try:
-    # tkinterをモックして、main.pyがインポートできるか確認
-    import unittest.mock as mock
-    
-    # tkinterをモック
-    sys.modules['tkinter'] = mock.MagicMock()
-    sys.modules['tkinter.filedialog'] = mock.MagicMock()
-    sys.modules['tkinter.messagebox'] = mock.MagicMock()
-    sys.modules['tkinter.ttk'] = mock.MagicMock()
-    
+
+class _AnyWidget:
+    """何を参照・呼び出しされても黙って受けるtkinterスタブ用クラス
+
+    MagicMockと違い呼び出し履歴や属性の自動生成機構を持たないため、
+    main.pyのインポート時にtk.Frame等へ触れるコストがほぼゼロになる。
+    """
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __getattr__(self, _name):
+        return _AnyWidget
+
+    def __call__(self, *args, **kwargs):
+        return _AnyWidget()
+
+
+def check_main_import():
+    """tkinterをスタブ化した上でmain.pyをインポートして属性を確認する
+
+    main.pyはpandasやGoogle API系の重いモジュールを連鎖的に読み込む
+    ため、ここまでの軽いチェックが終わってから遅延インポートする。
+    """
+    import types
+
+    # tkinter一式を1個の軽量スタブモジュールで置き換える
+    stub = types.ModuleType('tkinter')
+    stub.__getattr__ = lambda _name: _AnyWidget
+    for name in ('tkinter', 'tkinter.filedialog',
+                 'tkinter.messagebox', 'tkinter.ttk'):
+        sys.modules[name] = stub
+
     # main.pyをインポート
     import main
-    
+
     # 必要な属性を確認
     if hasattr(main, 'GEMINI_BRIDGE_AVAILABLE'):
         if main.GEMINI_BRIDGE_AVAILABLE:
@@ -79,7 +110,12 @@ try:
             print("  ⚠️ GEMINI_BRIDGE_AVAILABLE: False")
     else:
         print("  ❌ GEMINI_BRIDGE_AVAILABLE が定義されていません")
-    
+
+
+# 4. GUI起動チェック（tkinterなし）
+print("【4. main.pyのインポートチェック】")
+try:
+    check_main_import()
 except Exception as e:
     print(f"  ❌ main.pyのインポートエラー: {e}")
 
@@ -90,8 +126,9 @@ print("【5. 統合の準備状態】")
 all_ok = True
 
 checks = [
-    ("GeminiBridge利用可能", lambda: GeminiBridge().check_availability()),
-    ("API Key設定済み", lambda: bool(os.getenv('GEMINI_API_KEY'))),
+    # セクション3で構築済みのbridgeを使い回す（再初期化しない）
+    ("GeminiBridge利用可能", lambda: bridge is not None and bridge.check_availability()),
+    ("API Key設定済み", lambda: bool(api_key)),
     ("analyze_with_gemini_detailed.py存在", lambda: Path("analyze_with_gemini_detailed.py").exists())
 ]
 
@@ -120,4 +157,4 @@ if all_ok:
 else:
     print("⚠️ 一部の準備が完了していません")
 
-print("=" * 60)
\ No newline at end of file
+print("=" * 60)
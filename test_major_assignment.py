@@ -3,12 +3,18 @@
 大問への問題割り当てを診断するテストスクリプト
 """
 
+import re
 import sys
 import os
+from itertools import islice
 sys.path.insert(0, '/Users/yoshiikatsuhiko/Desktop/02_開発 (Development)/social_exam_analyzer')
 
 from patterns.hierarchical_extractor_fixed import HierarchicalExtractorFixed
 
+# 問番号のパターンは大問ごとのループで使うため、読み込み時に1回だけ
+# コンパイルしておく
+_QNUM_RE = re.compile(r'問(\d+)')
+
 # テスト用のサンプルテキスト（実際のPDFに似た構造）
 sample_text = """
 社会
@@ -107,13 +113,14 @@ def test_extraction():
         end = structure[i + 1].position[0] if i + 1 < len(structure) else len(sample_text)
         print(f"\n大問{major.number}の範囲: {start} - {end}")
         
-        # この範囲内の問を確認
+        # この範囲内の問を確認（マッチをリスト化せず、表示用の先頭5件
+        # だけisliceで取り、件数は別走査のsumで数える）
         range_text = sample_text[start:end]
-        import re
-        question_matches = list(re.finditer(r'問(\d+)', range_text))
-        print(f"  テキスト内で検出された問: {len(question_matches)}個")
-        if question_matches:
-            found_numbers = [m.group(1) for m in question_matches[:5]]
+        found_numbers = [m.group(1)
+                         for m in islice(_QNUM_RE.finditer(range_text), 5)]
+        match_count = sum(1 for _ in _QNUM_RE.finditer(range_text))
+        print(f"  テキスト内で検出された問: {match_count}個")
+        if found_numbers:
             print(f"  最初の5つ: 問{', 問'.join(found_numbers)}")
         
         print(f"  実際に割り当てられた問: {len(major.children)}個")
@@ -2,12 +2,14 @@
 """
 OCRフラグメント100%除去テスト
 """
+import re
 import sys
 import logging
 from pathlib import Path
-from modules.ocr_handler import OCRHandler
 from modules.social_analyzer_fixed import FixedSocialAnalyzer
 from modules.gemini_theme_analyzer import GeminiThemeAnalyzer
+from modules.text_index import TextIndex
+from tests._fixture_cache import ocr_pdf_cached
 
 # ログ設定
 logging.basicConfig(level=logging.INFO, format='%(message)s')
@@ -23,16 +25,19 @@ def main():
     print('=' * 60)
     print(f'PDFファイル: {Path(pdf_path).name}')
     
-    # OCRでテキスト抽出
+    # OCRでテキスト抽出（内容ハッシュ鍵のディスクキャッシュ
+    # logs/.ocr_cache を備えた共有ヘルパー経由。PDFが変われば
+    # ハッシュが変わるので自動的に無効化される）
     print('\n1. OCR処理中...')
-    ocr = OCRHandler()
-    text = ocr.process_pdf(pdf_path)
+    text = ocr_pdf_cached(pdf_path)
     print(f'   抽出完了: {len(text)}文字')
     
-    # 分析実行
+    # 分析実行（位置インデックスを1回構築して共有し、
+    # 下流での全文再走査を省く）
     print('\n2. 問題分析中...')
+    index = TextIndex.build(text)
     analyzer = FixedSocialAnalyzer()
-    result = analyzer.analyze_document(text)
+    result = analyzer.analyze_document(text, index=index)
     print(f'   抽出問題数: {len(result["all_questions"])}問')
     
     # OCRフラグメントのチェック（修正前）
@@ -116,21 +121,26 @@ def main():
     print('テスト完了')
     print('=' * 60)
 
+# 修正案の表と、全パターンを束ねた1本の検索用正規表現。
+# パターンごとのin判定を重ねず、フラグメントを1回走査して辞書で引く。
+# 分野によって提案が変わる項目があるため、値はfieldを受ける関数にする
+_CORRECTIONS = {
+    '記号 文武': lambda field: '文武天皇の政治' if field == '歴史' else '奈良時代の文化',
+    '兵庫県明': lambda field: '明治時代の地方制度' if field == '歴史' else '兵庫県の産業',
+    '朱子学以外': lambda field: '江戸時代の学問',
+    '記号 下線部': lambda field: f'{field}総合問題',
+    '核兵器 下線部': lambda field: '核兵器と国際平和',
+    '新詳日本史': lambda field: '日本史総合',
+}
+_CORRECTION_RE = re.compile('|'.join(map(re.escape, _CORRECTIONS)))
+
+
 def suggest_correction(fragment: str, field: str) -> str:
     """OCRフラグメントの修正案を提案"""
-    corrections = {
-        '記号 文武': '文武天皇の政治' if field == '歴史' else '奈良時代の文化',
-        '兵庫県明': '明治時代の地方制度' if field == '歴史' else '兵庫県の産業',
-        '朱子学以外': '江戸時代の学問',
-        '記号 下線部': f'{field}総合問題',
-        '核兵器 下線部': '核兵器と国際平和',
-        '新詳日本史': '日本史総合'
-    }
-    
-    for pattern, suggestion in corrections.items():
-        if pattern in fragment:
-            return suggestion
-    
+    match = _CORRECTION_RE.search(fragment)
+    if match is not None:
+        return _CORRECTIONS[match.group(0)](field)
+
     return f'{field}関連問題'
 
 if __name__ == '__main__':
@@ -86,13 +86,19 @@ def test_disordered():
         total_questions += major_q_count
         print(f"\n大問{major.number}: {major_q_count}問検出")
         
-        # 問題番号を全て表示
+        # 問題番号の列挙と重複チェックを1回の走査で済ませる
         if major.children:
-            q_numbers = [q.number for q in major.children]
+            seen = set()
+            has_duplicate = False
+            q_numbers = []
+            for q in major.children:
+                q_numbers.append(q.number)
+                if q.number in seen:
+                    has_duplicate = True
+                seen.add(q.number)
             print(f"  問番号: {', '.join(q_numbers)}")
-            
-            # 重複や異常をチェック
-            if len(q_numbers) != len(set(q_numbers)):
+
+            if has_duplicate:
                 print(f"  ⚠️ 重複あり！")
             
             # 期待される番号との差異をチェック
@@ -3,30 +3,48 @@
 テーマ抽出器の業績修正テスト
 """
 
+import functools
+
 from modules.enhanced_theme_extractor import EnhancedThemeExtractor
 
+# 抽出器はパターン辞書の構築が重いため、再実行時はインスタンスを共有する
+_get_instance = functools.lru_cache(maxsize=None)(lambda cls: cls())
+
+
+def _clip(s: str, n: int) -> str:
+    """表示用にn文字へ切り詰める（収まっていれば元の文字列をそのまま返す）"""
+    return s if len(s) <= n else s[:n] + '...'
+
+# テストケースは呼び出しごとに再構築しないようモジュールレベルで確保する
+_GYOSEKI_CASES = (
+    ("兵庫県明について説明しなさい", "兵庫県明の業績", "歴史"),
+    ("真鍋淑郎氏がノーベル賞を受賞しました", "真鍋淑郎氏の業績", "歴史"),
+    ("日宋貿易について答えなさい", "日宋貿易の業績", "歴史"),
+    ("朱子学以外の学問", "朱子学以外の業績", "歴史"),
+    ("新詳日本史について", "新詳日本史の業績", "歴史"),
+)
+
+_EXTRACT_TEXTS = (
+    "兵庫県明について説明しなさい",
+    "真鍋淑郎氏が2021年にノーベル物理学賞を受賞しました",
+    "日宋貿易の特徴を答えなさい",
+)
+
+
 def test_gyoseki_fix():
     """業績パターンの修正をテスト"""
-    extractor = EnhancedThemeExtractor()
-    
-    test_cases = [
-        ("兵庫県明について説明しなさい", "兵庫県明の業績", "歴史"),
-        ("真鍋淑郎氏がノーベル賞を受賞しました", "真鍋淑郎氏の業績", "歴史"),
-        ("日宋貿易について答えなさい", "日宋貿易の業績", "歴史"),
-        ("朱子学以外の学問", "朱子学以外の業績", "歴史"),
-        ("新詳日本史について", "新詳日本史の業績", "歴史"),
-    ]
-    
+    extractor = _get_instance(EnhancedThemeExtractor)
+
     print("=== 業績パターン修正テスト ===\n")
-    
-    for text, original_theme, field in test_cases:
+
+    for text, original_theme, field in _GYOSEKI_CASES:
         # _is_invalid_themeのテスト
         is_invalid = extractor._is_invalid_theme(original_theme)
         
         # _fix_invalid_themeのテスト
         fixed_theme = extractor._fix_invalid_theme(original_theme, text, field)
         
-        print(f"原文: {text[:30]}...")
+        print(f"原文: {_clip(text, 30)}")
         print(f"元テーマ: {original_theme}")
         print(f"無効判定: {is_invalid}")
         print(f"修正後: {fixed_theme}")
@@ -34,14 +52,8 @@ def test_gyoseki_fix():
     
     # extract_theme全体のテスト
     print("\n=== extract_theme統合テスト ===\n")
-    
-    test_texts = [
-        "兵庫県明について説明しなさい",
-        "真鍋淑郎氏が2021年にノーベル物理学賞を受賞しました",
-        "日宋貿易の特徴を答えなさい",
-    ]
-    
-    for text in test_texts:
+
+    for text in _EXTRACT_TEXTS:
         result = extractor.extract_theme(text, field="歴史")
         print(f"入力: {text}")
         print(f"結果: {result}")
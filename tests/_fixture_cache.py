@@ -0,0 +1,29 @@
+"""
+テスト用フィクスチャのキャッシュ
+
+複数のテストスクリプトが同じOCRテキスト（logs/ocr_*.txt）や
+同じPDFのOCR結果を読み直しているため、ここで一元的にメモ化する。
+PDFのOCR結果は OCRHandler 側の内容ハッシュによるディスクキャッシュ
+（logs/.ocr_cache）にも載るので、プロセスをまたいでも再OCRは走らない。
+"""
+
+import functools
+import sys
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+
+@functools.lru_cache(maxsize=8)
+def load_ocr_text(path: str) -> str:
+    """OCRテキストファイルを読み込む（同一パスは1回だけ読む）"""
+    return Path(path).read_text(encoding='utf-8')
+
+
+@functools.lru_cache(maxsize=4)
+def ocr_pdf_cached(pdf_path: str):
+    """PDFをOCRしてテキストを返す（同一パスはプロセス内で1回だけ）"""
+    from modules.ocr_handler import OCRHandler
+    return OCRHandler().process_pdf(pdf_path)
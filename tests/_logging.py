@@ -0,0 +1,32 @@
+"""
+テスト用ロギング設定の共通化
+
+各テストスクリプトが冒頭で logging.basicConfig を重複して呼んでいた。
+2回目以降のbasicConfigはハンドラ走査だけして何もしない（no-op）ため、
+ここで1回だけ初期化するようにまとめ、複数テストを同一プロセスで
+走らせたときの二重出力も防ぐ。
+"""
+
+import logging
+
+_DONE = False
+
+
+def setup(level=logging.INFO, fmt=None, with_time=False):
+    """ロギングを1回だけ初期化する
+
+    Args:
+        level: ルートロガーのレベル
+        fmt: ログフォーマット（未指定ならloggingの既定）
+        with_time: Trueなら時刻付きの標準フォーマットを使う
+    """
+    global _DONE
+    if _DONE:
+        return
+    if fmt is None and with_time:
+        fmt = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    if fmt is not None:
+        logging.basicConfig(level=level, format=fmt)
+    else:
+        logging.basicConfig(level=level)
+    _DONE = True
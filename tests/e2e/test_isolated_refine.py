@@ -5,7 +5,7 @@ import re
 from typing import Optional
 from dataclasses import dataclass
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ExtractedTheme:
     """抽出されたテーマ"""
     theme: Optional[str]
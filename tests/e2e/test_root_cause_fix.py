@@ -4,6 +4,7 @@
 除外されるべきテーマが確実に除外されているかを確認
 """
 
+import functools
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -12,14 +13,24 @@ from modules.social_analyzer_fixed import FixedSocialAnalyzer
 import logging
 
 # ログレベル設定
-logging.basicConfig(level=logging.DEBUG)
+# DEBUGログはTEST_DEBUG指定時のみ。通常はWARNINGに抑えて
+# アナライザーのログ整形・出力コストをisEnabledForで短絡させる
+logging.basicConfig(
+    level=logging.DEBUG if os.getenv('TEST_DEBUG') else logging.WARNING)
 logger = logging.getLogger(__name__)
 
+
+# アナライザーは構築コストが大きい（パターン表構築・辞書読み込み）ため、
+# プロセス内で1個だけ作ってテスト間で共有する
+@functools.lru_cache(maxsize=None)
+def _fixed_analyzer() -> FixedSocialAnalyzer:
+    return FixedSocialAnalyzer()
+
 def test_root_cause_fix():
     """根本原因修正のテスト"""
-    
-    # 修正版アナライザーを初期化
-    analyzer = FixedSocialAnalyzer()
+
+    # 修正版アナライザーを初期化（プロセス内で共有）
+    analyzer = _fixed_analyzer()
     
     # 問題のあるテーマを含む問題文
     problematic_questions = [
@@ -55,8 +66,8 @@ def test_root_cause_fix():
 
 def test_valid_themes():
     """有効なテーマが正しく抽出されるかテスト"""
-    
-    analyzer = FixedSocialAnalyzer()
+
+    analyzer = _fixed_analyzer()
     
     # 有効なテーマを含む問題文
     valid_questions = [
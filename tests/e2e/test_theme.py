@@ -4,15 +4,28 @@
 """
 
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from modules.social_analyzer import SocialAnalyzer
 
+# ワーカープロセスごとのアナライザー（初回呼び出し時に遅延構築）
+_worker_analyzer = None
+
+
+def _analyze_one(args):
+    """1問を分析する（各設問は独立・ステートレスなので並列化できる）"""
+    global _worker_analyzer
+    if _worker_analyzer is None:
+        _worker_analyzer = SocialAnalyzer()
+    i, text = args
+    return _worker_analyzer.analyze_question(text, f"問{i}")
+
+
 def test_theme_extraction():
     """テーマ抽出のテスト"""
-    analyzer = SocialAnalyzer()
-    
+
     test_questions = [
         "次の地図を見て、日本の四大工業地帯の名称をすべて答えなさい。",
         "江戸時代の参勤交代制度について、その目的と影響を説明しなさい。",
@@ -33,9 +46,13 @@ def test_theme_extraction():
     
     print("【テーマ抽出テスト結果】")
     print("=" * 70)
-    
-    for i, text in enumerate(test_questions, 1):
-        question = analyzer.analyze_question(text, f"問{i}")
+
+    # CPUバウンドで相互に独立な分析をプロセスプールで並列実行し、
+    # 結果は入力順のまま受け取って表示する
+    with ProcessPoolExecutor() as executor:
+        results = list(executor.map(_analyze_one, enumerate(test_questions, 1)))
+
+    for i, (text, question) in enumerate(zip(test_questions, results), 1):
         print(f"\n問{i}:")
         print(f"  問題文: {text[:50]}...")
         print(f"  抽出テーマ: {question.topic if question.topic else '（抽出できず）'}")
@@ -23,8 +23,9 @@ extractor = ThemeExtractorV2()
 
 print("=== 実際の問題文でのテーマ抽出テスト ===\n")
 
-for i, text in enumerate(actual_texts, 1):
-    result = extractor.extract(text)
+results = extractor.extract_batch(actual_texts, max_workers=4)
+
+for i, (text, result) in enumerate(zip(actual_texts, results), 1):
     print(f"問題{i}:")
     print(f"  テキスト: {text[:50]}...")
     if result.theme:
@@ -6,6 +6,7 @@
 
 import sys
 import os
+from collections import Counter
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from modules.social_analyzer_fixed import FixedSocialAnalyzer
@@ -54,14 +55,11 @@ def test_integration():
     
     questions = analyzer._extract_with_reset_detection(test_text)
     
-    # 大問ごとに集計
-    large_sections = {}
-    for q_id, q_text in questions:
-        if '-' in q_id:
-            large_num = q_id.split('-')[0]
-            if large_num not in large_sections:
-                large_sections[large_num] = 0
-            large_sections[large_num] += 1
+    # 大問ごとに集計（Counter の1パスで初期化込みの集計を行う。
+    # split('-', 1) で最初の区切り以降の走査を省く）
+    large_sections = Counter(
+        q_id.split('-', 1)[0] for q_id, _ in questions if '-' in q_id
+    )
     
     if len(large_sections) >= 2:
         print(f"  ✅ {len(large_sections)}個の大問を検出")
@@ -3,6 +3,7 @@
 実際のPDFファイルで改善されたテーマ抽出をテスト
 """
 
+import re
 import sys
 from pathlib import Path
 from modules.social_analyzer import SocialAnalyzer
@@ -10,6 +11,13 @@ from modules.ocr_handler import OCRHandler
 from modules.text_formatter import TextFormatter
 from modules.improved_theme_extractor import ImprovedThemeExtractor
 
+# 不適切テーマの判定語。トークンごとのin判定を重ねず、
+# 1本の選択肢正規表現でトピックを1回走査して分類する
+_BAD_TOPIC_RE = re.compile('|'.join(map(re.escape, [
+    '下線', 'この時期', '各都市', 'まちがっている', '正しい', '空らん', '空欄'
+])))
+
+
 def analyze_pdf_with_improved_extractor(pdf_path: str):
     """改善されたテーマ抽出でPDFを分析"""
     
@@ -46,12 +54,10 @@ def analyze_pdf_with_improved_extractor(pdf_path: str):
     for q in questions:
         if q.topic is None:
             none_themes.append(q)
-        elif any(bad in q.topic for bad in ['下線', 'この時期', '各都市', 'まちがっている', '正しい', '空らん', '空欄']):
+        elif _BAD_TOPIC_RE.search(q.topic) or len(q.topic) <= 2:
             bad_themes.append((q.number, q.topic))
-        elif len(q.topic) > 2:
-            good_themes.append((q.number, q.topic))
         else:
-            bad_themes.append((q.number, q.topic))
+            good_themes.append((q.number, q.topic))
     
     # 良いテーマ
     print(f"✅ 良いテーマ: {len(good_themes)}問")
@@ -87,8 +93,8 @@ def analyze_pdf_with_improved_extractor(pdf_path: str):
     print("=== テキストファイル保存テスト ===")
     
     output_dir = Path("/Users/yoshiikatsuhiko/Desktop/過去問_社会")
-    if not output_dir.exists():
-        output_dir.mkdir(parents=True)
+    # existsで事前確認せずexist_okで1回のmkdirに任せる
+    output_dir.mkdir(parents=True, exist_ok=True)
     
     output_file = output_dir / "東京電機大学中学校_2020_社会_改善版.txt"
     
@@ -99,15 +105,13 @@ def analyze_pdf_with_improved_extractor(pdf_path: str):
         f.write(content)
     
     print(f"✅ ファイル保存: {output_file}")
-    
-    # 保存されたファイルのテーマ部分を確認
-    with open(output_file, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
-    
+
+    # テーマ部分の確認は保存済みのcontentをそのまま走査する
+    # （書いたファイルを読み直すディスク往復を省く）
     in_theme_section = False
     theme_lines = []
-    
-    for line in lines:
+
+    for line in content.splitlines():
         if '【出題テーマ一覧】' in line:
             in_theme_section = True
         elif in_theme_section:
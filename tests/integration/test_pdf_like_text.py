@@ -9,9 +9,11 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from modules.social_analyzer_fixed import FixedSocialAnalyzer
 import logging
+import os
 
-# デバッグログを有効化
-logging.basicConfig(level=logging.INFO)
+# 詳細ログはTEST_DEBUG指定時のみ有効化（通常はWARNINGに抑える）
+logging.basicConfig(
+    level=logging.INFO if os.getenv('TEST_DEBUG') else logging.WARNING)
 logger = logging.getLogger(__name__)
 
 def test_with_pdf_like_text():
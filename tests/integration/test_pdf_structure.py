@@ -20,45 +20,46 @@ text = """
 問3 日露戦争の頃には鉄鋼業などの重工業がさかんになった理由を説明しなさい。
 """
 
-# 問題番号パターンのテスト
-patterns = [
-    # パターン1: 基本パターン
-    (r'問\s*(\d+)', "基本"),
-    # パターン2: 全角数字も含む
-    (r'問\s*([０-９\d]+)', "全角対応"),
-    # パターン3: 大問の検出
-    (r'^(\d+)\.\s*次の', "大問"),
-    # パターン4: リセット検出用
-    (r'問\s*([０-９\d]+)(.{0,100})', "内容付き"),
-]
+# 問題番号の抽出を1本のトークナイザにまとめる。
+# 大問・小問・内容付きの各パターンで全文を別々に走査せず、
+# 名前付きグループの選択肢で1回の走査から種別付きトークンを得る
+_TOKEN_RE = re.compile(
+    r'(?P<MAJOR>^(\d+)\.\s*次の)'
+    r'|(?P<Q>問\s*([０-９\d]+)(.{0,100}))',
+    re.MULTILINE,
+)
 
-for pattern_str, name in patterns:
-    pattern = re.compile(pattern_str, re.MULTILINE)
-    matches = pattern.findall(text)
-    print(f"\n{name}パターン:")
-    for match in matches[:5]:  # 最初の5件のみ表示
-        if isinstance(match, tuple):
-            print(f"  - {match}")
-        else:
-            print(f"  - {match}")
+# 階層認識用のパターンもモジュールスコープで1回だけコンパイルする
+_MAJOR_RE = re.compile(r'^(\d+)\.\s*(.+?)$', re.MULTILINE)
+_MINOR_RE = re.compile(r'問\s*([０-９\d]+)')
+
+tokens = {'MAJOR': [], 'Q': []}
+for m in _TOKEN_RE.finditer(text):
+    if m.group('MAJOR') is not None:
+        tokens['MAJOR'].append(m.group(2))
+    else:
+        tokens['Q'].append((m.group(4), m.group(5)))
+
+for token_type, values in tokens.items():
+    print(f"\n{token_type}トークン:")
+    for value in values[:5]:  # 最初の5件のみ表示
+        print(f"  - {value}")
 
 # 大問と小問の階層構造を認識
 print("\n=== 階層構造の認識 ===")
 
 # 大問を探す
-major_pattern = re.compile(r'^(\d+)\.\s*(.+?)$', re.MULTILINE)
-major_matches = list(major_pattern.finditer(text))
+major_matches = list(_MAJOR_RE.finditer(text))
 
 if major_matches:
     print(f"大問数: {len(major_matches)}")
-    for match in major_matches:
+    for i, match in enumerate(major_matches):
         print(f"  大問{match.group(1)}: {match.group(2)[:30]}...")
-        
-        # その大問内の小問を探す
+
+        # その大問内の小問を探す（次の大問の開始位置までが範囲）
         start = match.end()
-        end = major_matches[major_matches.index(match) + 1].start() if major_matches.index(match) < len(major_matches) - 1 else len(text)
+        end = major_matches[i + 1].start() if i + 1 < len(major_matches) else len(text)
         section = text[start:end]
-        
-        minor_pattern = re.compile(r'問\s*([０-９\d]+)')
-        minor_matches = minor_pattern.findall(section)
+
+        minor_matches = _MINOR_RE.findall(section)
         print(f"    小問: {minor_matches}")
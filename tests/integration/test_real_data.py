@@ -4,14 +4,29 @@
 実際の問題データを使用して改善効果を確認
 """
 
+import functools
+
 from modules.social_analyzer import SocialAnalyzer
 from modules.improved_theme_extractor import ImprovedThemeExtractor
 
+
+# アナライザー・抽出器は構築時にパターン表の構築や辞書読み込みを行うため、
+# プロセス内で1個だけ作ってテスト間で共有する
+@functools.lru_cache(maxsize=None)
+def _analyzer() -> SocialAnalyzer:
+    return SocialAnalyzer()
+
+
+@functools.lru_cache(maxsize=None)
+def _theme_extractor() -> ImprovedThemeExtractor:
+    return ImprovedThemeExtractor()
+
+
 def test_real_problematic_cases():
     """実際に問題のあったケースをテスト"""
-    
-    analyzer = SocialAnalyzer()
-    extractor = ImprovedThemeExtractor()
+
+    analyzer = _analyzer()
+    extractor = _theme_extractor()
     
     # 実際の問題のあったケース（ユーザーが報告したもの）
     real_cases = [
@@ -59,8 +74,8 @@ def test_real_problematic_cases():
 
 def test_theme_extraction_quality():
     """テーマ抽出品質の包括的テスト"""
-    
-    analyzer = SocialAnalyzer()
+
+    analyzer = _analyzer()
     
     test_questions = [
         # 良い結果が期待されるもの